@@ -6,23 +6,43 @@ return {
         },
         nlohmann = {
             version = "v3.11.3",
-            include_in_build = true,
+            include_in_build = false,
+            header_only = true,
+            include_roots = {
+                "single_include",
+            },
         },
         asio = {
             version = "asio-1-29-0",
-            include_in_build = true,
+            include_in_build = false,
+            header_only = true,
+            include_roots = {
+                "asio/include",
+            },
         },
         glm = {
             version = "0.9.9.8",
-            include_in_build = true,
+            include_in_build = false,
+            header_only = true,
+            include_roots = {
+                ".",
+            },
         },
         catch2 = {
             version = "v2.13.7",
-            include_in_build = true,
+            include_in_build = false,
+            header_only = true,
+            include_roots = {
+                "single_include",
+            },
         },
         observable = {
             version = "v1.0.0",
-            include_in_build = true,
+            include_in_build = false,
+            header_only = true,
+            include_roots = {
+                "observable/include",
+            },
         },
         sfml = {
             version = "2.6.1",
@@ -1,5 +1,6 @@
 local config = require "common_paths"
 local package_info = require "package_info"
+local unity_build = require "unity_build"
 
 local project_key = "spdlog"
 project (project_key)
@@ -28,14 +29,24 @@ project (project_key)
     print("spdlog include dir: " .. include_dir)
     print("spdlog source dir: " .. src_dir)
 
-    files {
-        path.join(include_dir, "**.h"),
-        path.join(src_dir, "**.cpp")
-    }
-    
-    includedirs {
-        include_dir
-    }
+    local manifest = package_info.packages[project_key].manifest
+    if manifest then
+        -- Precomputed by the bootstrapper so premake doesn't have to glob the checkout.
+        files(manifest.files)
+        includedirs(manifest.include_dirs)
+    else
+        files {
+            path.join(include_dir, "**.h"),
+            path.join(src_dir, "**.cpp")
+        }
+
+        includedirs {
+            include_dir
+        }
+    end
+
+    -- Compiles the generated unity files instead of each source when unity builds are on.
+    unity_build.apply(package_info.packages[project_key].unity)
 
     filter "system:windows"
         systemversion "latest"
@@ -0,0 +1,21 @@
+-- Unity builds are generated by the bootstrapper (see scripts/unity_build.py) and passed
+-- through package_info.lua as { units = {...}, sources = {...} }. The original sources stay
+-- in the project so they still show up in the IDE, but only the units get compiled.
+local unity_build = {}
+
+function unity_build.apply(unity)
+    if not unity then
+        return
+    end
+
+    print("Using " .. #unity.units .. " unity files for " .. #unity.sources .. " sources.")
+    files(unity.units)
+
+    for _, source in ipairs(unity.sources) do
+        filter { "files:" .. source }
+            flags { "ExcludeFromBuild" }
+    end
+    filter {}
+end
+
+return unity_build
@@ -4,6 +4,9 @@ local common_paths = require "common_paths"
 -- Contains the actual user-selected packages to be included for the project.
 local package_info = require "package_info"
 
+-- Swaps project sources for bootstrapper-generated unity files when enabled.
+local unity_build = require "unity_build"
+
 -- Commandline option sent to premake.
 newoption {
     trigger = "sln_name",
@@ -86,7 +89,10 @@ local external_packages = {}
 
 group "contrib"
 for pkg_name, pkg in pairs(package_info.packages) do
-    if pkg.include_in_build == true then
+    if pkg.header_only == true then
+        -- Nothing to build, its include dirs are added to every project below.
+        print("Handling " .. pkg_name .. " as a header-only package.")
+    elseif pkg.include_in_build == true then
         print("Handling " .. pkg_name .. " as normal package.")
         local premake_script_path = path.join(common_paths.sln_dir,
             "premake/supported-packages", pkg_name, pkg.version, "premake.lua")
@@ -161,7 +167,14 @@ for pkg_name, pkg in pairs(package_info.packages) do
     for key, value in pairs(pkg) do
         print("  " .. key .. ": " .. tostring(value))
     end
-    if pkg.include_in_build and common_paths.project_includes[pkg_name] then
+    if pkg.header_only then
+        local checkout_dir = path.join(common_paths.package_cache, pkg_name, pkg.version, pkg_name)
+        for _, include_root in ipairs(pkg.include_roots) do
+            local include_dir = path.join(checkout_dir, include_root)
+            table.insert(contrib_includes, include_dir)
+            print("Adding header-only include directory for package '" .. pkg_name .. "': " .. include_dir)
+        end
+    elseif pkg.include_in_build and common_paths.project_includes[pkg_name] then
         table.insert(contrib_includes, common_paths.project_includes[pkg_name])
         -- Print the directory being added to the include path
         print("Adding include directory for package '" .. pkg_name .. "': " .. common_paths.project_includes[pkg_name])
@@ -184,6 +197,10 @@ for _, lib_dir in ipairs(static_lib_dirs) do
     defines{contrib_defines}
 
     recursiveAddFiles(lib_dir)
+    if package_info.static_unity then
+        unity_build.apply(package_info.static_unity[lib_name])
+    end
+
     filter "configurations:Debug"
         defines { "DEBUG" }
         symbols "On"
@@ -0,0 +1,383 @@
+"""
+This module provides a shared cache for package build outputs. Every machine that builds
+a package from the same inputs ends up with the same libs, so the first one to build
+publishes them and everyone else fetches them instead of compiling.
+
+Entries are keyed by package, commit, presets hash, toolchain and the package's selected
+modules. Each published build is
+stored as an immutable, content-addressed archive plus a small ref file that points at it.
+Uploaders never overwrite each other's archives and the ref is replaced atomically, so two
+machines publishing the same key at once always leave a consistent entry behind.
+
+The backing store is either a plain directory (a network share works fine) or an HTTP
+server that understands GET/HEAD/PUT. This file can host a directory over HTTP itself:
+
+    python scripts/artifact_cache.py serve --dir D:/artifact-cache --port 8765
+"""
+
+
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+
+# Set to a directory or an http(s):// url to enable the shared cache.
+ARTIFACT_CACHE_ENV = 'ARTIFACT_CACHE'
+
+# Matches binaryDir in the presets we ship. Subdirectories listed here are the build
+# outputs that get shared between machines. Logs and hotspot reports travel with the libs
+# they describe.
+CMAKE_BUILD_DIRNAME = 'build'
+ARTIFACT_SUBDIRS = ['lib', 'logs', 'reports']
+
+# Written into a build dir holding the outputs of a key, so they aren't fetched again.
+ARTIFACT_MARKER_FILENAME = '.artifact_key'
+
+ARCHIVE_SUFFIX = '.tar.gz'
+REF_SUFFIX = '.ref.json'
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactIntegrityError(Exception):
+    def __init__(self, name, expected, actual):
+        self.message = (f"Artifact {name} failed its integrity check."
+                        f" expected sha256={expected} actual sha256={actual}")
+        super().__init__(self.message)
+
+
+def hash_file(file_path):
+    """Returns the sha256 hex digest of a file's contents."""
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(COPY_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def hash_json(data):
+    """Returns the sha256 hex digest of data's canonical json form."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+@dataclass(frozen=True)
+class ArtifactKey:
+    package: str
+    commit: str
+    presets_hash: str
+    toolchain: str
+    # Sorted, so the same selection always produces the same key.
+    modules: tuple[str, ...] = ()
+
+    def digest(self) -> str:
+        """
+        Returns a stable identifier for this key. Any change to any input produces a
+        different entry.
+        """
+        return hash_json(self.__dict__)
+
+    def ref_name(self) -> str:
+        return f"{self.package}/{self.digest()}{REF_SUFFIX}"
+
+    def archive_name(self, archive_sha256: str) -> str:
+        return f"{self.package}/{self.digest()}-{archive_sha256}{ARCHIVE_SUFFIX}"
+
+
+def has_artifact_marker(build_dir, key: ArtifactKey):
+    """Whether build_dir already holds the outputs restored or published under key."""
+    try:
+        marker = (Path(build_dir) / ARTIFACT_MARKER_FILENAME).read_text(encoding='utf-8')
+    except OSError:
+        return False
+    return marker.strip() == key.digest()
+
+
+def write_artifact_marker(build_dir, key: ArtifactKey):
+    (Path(build_dir) / ARTIFACT_MARKER_FILENAME).write_text(key.digest(), encoding='utf-8')
+
+
+def clear_artifact_marker(build_dir):
+    """Called before building, since a build that fails halfway leaves mixed outputs."""
+    try:
+        (Path(build_dir) / ARTIFACT_MARKER_FILENAME).unlink()
+    except FileNotFoundError:
+        pass
+
+
+class DirectoryArtifactStore:
+    """Stores blobs as files below a root directory."""
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _blob_path(self, name):
+        blob_path = (self.root / name).resolve()
+        if self.root.resolve() not in blob_path.parents:
+            raise ValueError(f"Artifact name escapes the cache root. name={name}")
+        return blob_path
+
+    def has(self, name):
+        return self._blob_path(name).is_file()
+
+    def get(self, name, destination_path):
+        """Copies the blob to destination_path. Returns False if it doesn't exist."""
+        blob_path = self._blob_path(name)
+        if not blob_path.is_file():
+            return False
+        shutil.copyfile(blob_path, destination_path)
+        return True
+
+    def put(self, name, source_path):
+        """
+        Writes the blob next to its final location first and then moves it into place,
+        so readers never see a partially written file.
+        """
+        blob_path = self._blob_path(name)
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=blob_path.parent, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file, open(source_path, 'rb') as source_file:
+                shutil.copyfileobj(source_file, temp_file, COPY_CHUNK_SIZE)
+            os.replace(temp_path, blob_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class HttpArtifactStore:
+    """Stores blobs on an HTTP server that supports GET, HEAD and PUT."""
+    def __init__(self, base_url, timeout=60):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _url(self, name):
+        return f"{self.base_url}/{name}"
+
+    def has(self, name):
+        request = urllib.request.Request(self._url(name), method='HEAD')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def get(self, name, destination_path):
+        try:
+            with urllib.request.urlopen(self._url(name), timeout=self.timeout) as response, \
+                    open(destination_path, 'wb') as destination_file:
+                shutil.copyfileobj(response, destination_file, COPY_CHUNK_SIZE)
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise
+
+    def put(self, name, source_path):
+        with open(source_path, 'rb') as source_file:
+            request = urllib.request.Request(self._url(name), data=source_file, method='PUT')
+            request.add_header('Content-Length', str(os.path.getsize(source_path)))
+            request.add_header('Content-Type', 'application/octet-stream')
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+
+
+class ArtifactCache:
+    def __init__(self, store):
+        self.store = store
+
+    @staticmethod
+    def open(location):
+        """Returns a cache backed by an http(s) url or a directory path."""
+        if location.startswith(('http://', 'https://')):
+            return ArtifactCache(HttpArtifactStore(location))
+        return ArtifactCache(DirectoryArtifactStore(location))
+
+    @staticmethod
+    def from_environment():
+        """Returns the cache configured by ARTIFACT_CACHE, or None if it isn't set."""
+        location = os.getenv(ARTIFACT_CACHE_ENV)
+        if not location:
+            return None
+        return ArtifactCache.open(location)
+
+    def has(self, key: ArtifactKey) -> bool:
+        return self.store.has(key.ref_name())
+
+    def fetch(self, key: ArtifactKey, destination_dir) -> bool:
+        """
+        Downloads the entry for key, verifies it and extracts it into destination_dir,
+        marking destination_dir as holding key's outputs.
+
+        Args:
+            key (ArtifactKey): The entry to fetch.
+            destination_dir (Path): Where the archived directories are restored to.
+
+        Returns:
+            bool indicating whether the entry existed and was restored.
+        """
+        with tempfile.TemporaryDirectory(prefix='artifact-') as temp_dir:
+            ref_path = Path(temp_dir) / 'ref.json'
+            try:
+                if not self.store.get(key.ref_name(), ref_path):
+                    return False
+                with open(ref_path, encoding='utf-8') as ref_file:
+                    ref = json.load(ref_file)
+
+                archive_path = Path(temp_dir) / f"artifact{ARCHIVE_SUFFIX}"
+                if not self.store.get(ref['archive'], archive_path):
+                    print(f"Artifact ref {key.ref_name()} points at missing archive {ref['archive']}")
+                    return False
+
+                actual_sha256 = hash_file(archive_path)
+                if actual_sha256 != ref['sha256']:
+                    raise ArtifactIntegrityError(ref['archive'], ref['sha256'], actual_sha256)
+            except (ArtifactIntegrityError, OSError, ValueError, KeyError, urllib.error.URLError) as e:
+                print(f"Error fetching artifact for {key.package}: {e}")
+                return False
+
+            Path(destination_dir).mkdir(parents=True, exist_ok=True)
+            with tarfile.open(archive_path, 'r:gz') as archive:
+                archive.extractall(destination_dir, filter='data')
+            write_artifact_marker(destination_dir, key)
+        print(f"Restored {key.package} build outputs from artifact cache.")
+        return True
+
+    def publish(self, key: ArtifactKey, source_dir, subdirs) -> bool:
+        """
+        Compresses subdirs of source_dir and uploads them under key. Once uploaded,
+        source_dir is marked as holding key's outputs.
+
+        Args:
+            key (ArtifactKey): The entry to publish.
+            source_dir (Path): The directory subdirs are relative to.
+            subdirs (list[str]): The directories to include in the archive.
+
+        Returns:
+            bool indicating whether the entry was uploaded.
+        """
+        source_dir = Path(source_dir)
+        existing_subdirs = [subdir for subdir in subdirs if (source_dir / subdir).is_dir()]
+        if not existing_subdirs:
+            print(f"Nothing to publish for {key.package} in {source_dir}")
+            return False
+
+        with tempfile.TemporaryDirectory(prefix='artifact-') as temp_dir:
+            archive_path = Path(temp_dir) / f"artifact{ARCHIVE_SUFFIX}"
+            with tarfile.open(archive_path, 'w:gz') as archive:
+                for subdir in existing_subdirs:
+                    archive.add(source_dir / subdir, arcname=subdir)
+
+            archive_sha256 = hash_file(archive_path)
+            ref = {
+                'key': key.__dict__,
+                'archive': key.archive_name(archive_sha256),
+                'sha256': archive_sha256,
+            }
+            ref_path = Path(temp_dir) / 'ref.json'
+            with open(ref_path, 'w', encoding='utf-8') as ref_file:
+                json.dump(ref, ref_file, indent=4)
+
+            try:
+                # The archive must land before the ref that points at it.
+                self.store.put(ref['archive'], archive_path)
+                self.store.put(key.ref_name(), ref_path)
+            except (OSError, urllib.error.URLError) as e:
+                print(f"Error publishing artifact for {key.package}: {e}")
+                return False
+        write_artifact_marker(source_dir, key)
+        print(f"Published {key.package} build outputs to artifact cache.")
+        return True
+
+
+class ArtifactRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serves a DirectoryArtifactStore over HTTP."""
+    store: DirectoryArtifactStore = None
+
+    def _blob_name(self):
+        return self.path.split('?', 1)[0].lstrip('/')
+
+    def _send_blob(self, include_body):
+        try:
+            blob_path = self.store._blob_path(self._blob_name())
+        except ValueError:
+            self.send_error(400)
+            return
+        if not blob_path.is_file():
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(blob_path.stat().st_size))
+        self.end_headers()
+        if include_body:
+            with open(blob_path, 'rb') as blob_file:
+                shutil.copyfileobj(blob_file, self.wfile, COPY_CHUNK_SIZE)
+
+    def do_HEAD(self):
+        self._send_blob(include_body=False)
+
+    def do_GET(self):
+        self._send_blob(include_body=True)
+
+    def do_PUT(self):
+        content_length = int(self.headers.get('Content-Length', 0))
+        with tempfile.NamedTemporaryFile(delete=False) as upload_file:
+            remaining = content_length
+            while remaining > 0:
+                chunk = self.rfile.read(min(COPY_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                upload_file.write(chunk)
+                remaining -= len(chunk)
+            upload_path = upload_file.name
+        try:
+            if remaining > 0:
+                self.send_error(400, "Upload ended early.")
+                return
+            self.store.put(self._blob_name(), upload_path)
+        except ValueError:
+            self.send_error(400)
+            return
+        finally:
+            os.remove(upload_path)
+        self.send_response(201)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def serve(root, host, port):
+    handler = type('BoundArtifactRequestHandler', (ArtifactRequestHandler,),
+                   {'store': DirectoryArtifactStore(root)})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    print(f"Serving artifact cache at http://{host}:{server.server_port} from {root}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared package build artifact cache.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help="Host a cache directory over HTTP.")
+    serve_parser.add_argument('--dir', required=True, help="Directory artifacts are stored in.")
+    serve_parser.add_argument('--host', default='0.0.0.0')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        Path(args.dir).mkdir(parents=True, exist_ok=True)
+        serve(args.dir, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
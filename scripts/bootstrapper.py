@@ -1,39 +1,23 @@
 import configparser
 import dearpygui.dearpygui as dpg
 from enum import Enum
-from git_helper import GitHelper
 import json
 import os
+from package_pipeline import (DirectoryAlreadyExistsError, PackagePipeline, STATUS_TEXT_PREFIX,
+                              STATUS_TEXT_ERROR_PREFIX, write_package_manager_batch_script)
+from package_store import FLAG_MODULES
 from pathlib import Path
 from tkinter import filedialog, Tk
-import re
 import random
 import string
-import shutil
-import subprocess
-import tempfile
+import sys
+from package_watcher import PackageWatcher
+from version_discovery import VersionIndex, VERSION_INDEX_FILENAME
 from module_dependency_helper import ModuleDependencyHelper as MDH, ModuleState
 from dataclasses import dataclass, field
 from collections import defaultdict
 
-# TODO: This needs to be configurable.
-#commands
-VS_DEV_COMMAND = r'"C:\Program Files\Microsoft Visual Studio\2022\Professional\VC\Auxiliary\Build\vcvars64.bat"'
-
-# First command: Configure the project using the default preset
-CMAKE_CONFIGURE_COMMAND = f'cmake --preset default'
-
-# Second command: Build the project using the release preset
-CMAKE_BUILD_COMMAND_RELEASE = f'cmake --build --preset release'
-
-# Third command: Build the project using the debug preset
-CMAKE_BUILD_COMMAND_DEBUG = f'cmake --build --preset debug'
-
 SLN_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
-PACKAGE_STORE_PATH = SLN_DIR / 'premake' / 'package_store.json'
-DEPENDENCIES_PATH = SLN_DIR / 'dependencies.json'
-SUPPORTED_PACKAGES_DIR = SLN_DIR / 'premake' / 'supported-packages'
-CMAKE_PRESETS_FILENAME = 'CMakePresets.json'
 
 # UI defaults
 NO_OUTPUT_DIR_SELECTED_TEXT = "Choose sln output dir..."
@@ -42,9 +26,6 @@ DISABLED_BUTTON_COLOR = (45, 45, 48)
 DISABLED_BUTTON_HOVER_COLOR = (45, 45, 48)
 DISABLED_BUTTON_ACTIVE_COLOR = (45, 45, 48)
 
-STATUS_TEXT_PREFIX = "Working..."
-STATUS_TEXT_ERROR_PREFIX = "Error:"
-
 
 def set_debugging_title():
     """
@@ -73,20 +54,6 @@ class SolutionNameMissingException(Exception):
         super().__init__(self.message)
 
 
-class PackageCacheNotSetError(Exception):
-    def __init__(self):
-        message = ("The 'PACKAGE_CACHE_PATH' environment variable is not set."
-                   " Please set this variable to the path of your package cache.")
-        super().__init__(message)
-
-
-class DirectoryAlreadyExistsError(Exception):
-    def __init__(self, directory, message="Directory already exists. directory="):
-        self.directory = directory
-        self.message = f"{message}: {directory}"
-        super().__init__(self.message)
-
-
 class PackageCheckBoxItem:
     def __init__(self, package_name, checkbox_id, is_checked=False):
         self.package_name = package_name
@@ -101,6 +68,18 @@ class PackageDropDownItem:
         self.current_version = current_version
 
 
+class ModuleCheckBoxItem:
+    """
+    Mirrors what a module checkbox widget currently shows, so it is only touched when
+    its state actually changes.
+    """
+    def __init__(self, module_id, is_shown=True, is_checked=False, is_enabled=True):
+        self.module_id = module_id
+        self.is_shown = is_shown
+        self.is_checked = is_checked
+        self.is_enabled = is_enabled
+
+
 class PackageCheckBoxGroupItem:
     def __init__(self, checkbox_item, dropdown_item, package_name):
         self.package_name = package_name
@@ -108,33 +87,6 @@ class PackageCheckBoxGroupItem:
         self.dropdown_item = dropdown_item
 
 
-def copy_modified_gitignore(source, destination):
-    print("Copy modified gitignore")
-    gitignore_path = source / '.gitignore'
-    destination_path = destination / '.gitignore'
-    
-    # Read the original .gitignore file
-    with gitignore_path.open('r') as file:
-        lines = file.readlines()
-
-    # We actually want generated projects to commit these files. This is how the Update
-    # system knows how to update itself.
-    lines_to_remove = [
-        "# Removed in UPDATE mode.\n",
-        "/dependencies.json\n",
-        "premake/generated/package_info.lua\n",
-        "/settings.ini\n",
-    ]
-
-    modified_lines = [line for line in lines if line not in lines_to_remove]
-
-    # Write the modified lines to the destination .gitignore
-    with destination_path.open('w') as file:
-        file.writelines(modified_lines)
-
-    print(f"Modified .gitignore copied to {destination_path}")
-
-
 class PackageSelectorGUI:
     def __init__(self):
         self.module_dependency_count = {}
@@ -143,6 +95,8 @@ class PackageSelectorGUI:
         self.checkbox_ids: defaultdict[str, int] = defaultdict(int)
         self.dropdown_ids = {}
         self.package_items = {}
+        # Package name to module name to the module's widget state.
+        self.module_items: dict[str, dict[str, ModuleCheckBoxItem]] = defaultdict(dict)
         self.window_id = None
         self.output_dir_label_id = None
         self.generate_button_id = None
@@ -150,28 +104,33 @@ class PackageSelectorGUI:
         self.update_button_id = None
         self.browse_button_id = None
         self.status_text_id = None
-        self.dependencies = {}
-        self.package_store = {}
+        self.pipeline = PackagePipeline(SLN_DIR, status_callback=self.set_status_text)
         self.mode = Mode.CREATE_NEW
         self.output_dir = ""
+        self.version_index = None
         self.module_dependency_helpers: dict[str, MDH] = defaultdict(MDH)
         self.create_gui()
+        self.start_version_discovery()
 
 
-    def load_package_store(self):
-        try:
-            with open(PACKAGE_STORE_PATH, encoding='utf-8') as file:
-                self.package_store = json.load(file)['package_store']
-        except FileNotFoundError:
-            self.package_store = {}
+    @property
+    def package_store(self):
+        return self.pipeline.package_store
 
 
-    def load_dependencies(self):
-        try:
-            with open(DEPENDENCIES_PATH, encoding='utf-8') as file:
-                self.dependencies = json.load(file)
-        except FileNotFoundError:
-            self.dependencies = {}
+    @property
+    def dependencies(self):
+        return self.pipeline.dependencies
+
+
+    @dependencies.setter
+    def dependencies(self, dependencies):
+        self.pipeline.dependencies = dependencies
+
+
+    def set_status_text(self, text):
+        if self.status_text_id is not None:
+            dpg.set_value(self.status_text_id, text)
 
     def create_default_settings(self):
         config = configparser.ConfigParser()
@@ -198,8 +157,14 @@ class PackageSelectorGUI:
                                                 fallback= NO_OUTPUT_DIR_SELECTED_TEXT)
         elif self.mode == Mode.UPDATE:
             self.solution_name = config_parser.get('DEFAULT', 'solution_name', fallback="default")
-        self.load_package_store()
-        self.load_dependencies()
+        self.pipeline.load_settings(config_parser)
+        self.pipeline.load_package_store()
+        self.pipeline.load_dependencies()
+
+        # The index is shared by every solution using this package cache.
+        package_cache_path_str = os.getenv('PACKAGE_CACHE_PATH')
+        if package_cache_path_str:
+            self.version_index = VersionIndex(Path(package_cache_path_str) / VERSION_INDEX_FILENAME)
 
 
     def is_item_enabled(self, item_id):
@@ -207,36 +172,46 @@ class PackageSelectorGUI:
         return config.get("enabled", True)
 
 
-    def update_module_dependency_checkboxes(self, parent_package_name):
+    def update_module_dependency_checkboxes(self, parent_package_name, module_states=None):
         """
-        Updates our module UI to reflect the state returned by the module helper.
+        Updates our module UI to reflect the state returned by the module helper. Only
+        widgets whose mirrored state differs from the helper's are touched.
+
+        Args:
+            parent_package_name (str): The package owning the modules.
+            module_states (list[ModuleState]): The modules that changed. Defaults to all of
+                them, which is needed when the package itself was checked or unchecked.
         """
         if parent_package_name not in self.module_dependency_helpers:
             return
 
-        module_states = self.module_dependency_helpers[parent_package_name].get_module_states()
-        is_checked = dpg.get_value(self.get_package_checkbox_id_by_name(parent_package_name))
-        # TODO: This file needs a refactor. A package should be an object that knows about its checked state.
-        # this way we only hide/show if it changed.
-        if not is_checked:
-            for module_state in module_states:
-                dpg.hide_item(module_state.module_id)
+        if module_states is None:
+            module_states = self.module_dependency_helpers[parent_package_name].get_module_states()
+        is_shown = self.package_items[parent_package_name].checkbox_item.is_checked
+
+        for module_state in module_states:
+            module_item = self.module_items[parent_package_name][module_state.name]
+            if module_item.is_shown != is_shown:
+                if is_shown:
+                    dpg.show_item(module_item.module_id)
+                else:
+                    dpg.hide_item(module_item.module_id)
+                module_item.is_shown = is_shown
+
             # If modules are hidden there's no reason to update them.
-            return
+            if not is_shown:
+                continue
 
-        if is_checked:
-            # TODO: this should not be necessary after a refactor. We're stuck doing this every time
-            # since we don't know if we were just shown or not.
-            for module_state in module_states:
-                dpg.show_item(module_state.module_id)
+            if module_item.is_checked != module_state.is_checked:
+                dpg.set_value(module_item.module_id, module_state.is_checked)
+                module_item.is_checked = module_state.is_checked
 
-        for module in module_states:
-            dpg.set_value(module.module_id, module.is_checked)
-            # TODO: For some reason system is unchecked by the time we get here. And also its enabled.
-            if module.is_enabled:
-                dpg.enable_item(module.module_id)
-            else:
-                dpg.disable_item(module.module_id)
+            if module_item.is_enabled != module_state.is_enabled:
+                if module_state.is_enabled:
+                    dpg.enable_item(module_item.module_id)
+                else:
+                    dpg.disable_item(module_item.module_id)
+                module_item.is_enabled = module_state.is_enabled
 
 
     def on_module_checkbox_checked(self, sender, app_data, user_data):
@@ -245,8 +220,11 @@ class PackageSelectorGUI:
         print(f"{check_state_str} {parent_package_name}.{module_name}")
 
         is_checked = app_data
-        self.module_dependency_helpers[parent_package_name].set_module_checked_state_by_name(module_name, is_checked)
-        self.update_module_dependency_checkboxes(parent_package_name)
+        # The click already changed what the widget shows.
+        self.module_items[parent_package_name][module_name].is_checked = is_checked
+        changed_module_states = self.module_dependency_helpers[parent_package_name].set_module_checked_state_by_name(
+            module_name, is_checked)
+        self.update_module_dependency_checkboxes(parent_package_name, changed_module_states)
         self.update_dependencies()
 
 
@@ -272,7 +250,7 @@ class PackageSelectorGUI:
             dpg.add_text("Packages")
             packages_with_modules = []
             # Package Items
-            for package_name, package_info in self.package_store.items():
+            for package_name in self.package_store:
                 with dpg.group(horizontal=True):
                     # Checkbox for the main package
                     checkbox_id = dpg.add_checkbox(label=package_name,
@@ -285,22 +263,25 @@ class PackageSelectorGUI:
                     dpg.set_value(checkbox_id, is_checked)
 
                     # Dropdown for the main package
-                    dropdown_id = dpg.add_combo(package_info['versions'],
-                                                default_value=self.dependencies.get(package_name, package_info['versions'][0]),
+                    versions = self.get_dropdown_versions(package_name)
+                    default_version = self.package_store.get_versions(package_name)[0]
+                    dropdown_id = dpg.add_combo(versions,
+                                                default_value=self.dependencies.get(package_name, default_version),
                                                 user_data=package_name,
                                                 callback=self.on_dropdown_changed)
                     self.dropdown_ids[dropdown_id] = package_name
-                    current_version = self.dependencies.get(package_name, package_info['versions'][0])
-                    dropdown_item = PackageDropDownItem(package_info['versions'], dropdown_id, current_version)
+                    current_version = self.dependencies.get(package_name, default_version)
+                    dropdown_item = PackageDropDownItem(versions, dropdown_id, current_version)
 
                     group_item = PackageCheckBoxGroupItem(checkbox_item, dropdown_item, package_name)
                     self.package_items[package_name] = group_item
 
                 # If the package has module definitions, create a separate vertical group for them
-                if "module_definitions" in package_info:
+                # Only these need their full manifest loaded to draw the module checkboxes.
+                if self.package_store.has_flag(package_name, FLAG_MODULES):
                     packages_with_modules.append(package_name)
                     module_states: defaultdict[str, list[ModuleState]] = defaultdict(list)
-                    for module in package_info["module_definitions"]:
+                    for module in self.package_store[package_name]["module_definitions"]:
                         module_state = ModuleState()
                         module_state.name = module
                         modules_key = f"{package_name}_modules"
@@ -320,8 +301,8 @@ class PackageSelectorGUI:
                                                                     callback=self.on_module_checkbox_checked,
                                                                     user_data=(package_name, module_state.name))
                                 module_state.module_id = module_id
-                                checkbox_item = PackageCheckBoxItem(module_state.name, module_state.module_id,
-                                    is_checked= module_state.is_checked)
+                                # Freshly added checkboxes are shown, unchecked and enabled.
+                                self.module_items[package_name][module_state.name] = ModuleCheckBoxItem(module_id)
 
             for package_name in packages_with_modules:
                 self.module_dependency_helpers[package_name] = MDH(list(module_states[package_name]))
@@ -332,6 +313,44 @@ class PackageSelectorGUI:
 
         #self.update_generate_button_is_enabled()
 
+    def get_dropdown_versions(self, package_name):
+        """
+        Returns the versions listed in the package's package.json followed by any the version
+        index discovered on the remote. Discovered versions are only offered if premake can
+        use them, i.e. the package is header-only or has scripts for that version.
+        """
+        versions = list(self.package_store.get_versions(package_name))
+        if self.version_index:
+            git_url = self.package_store.get_git_url(package_name)
+            for version in self.version_index.get_versions(package_name, git_url):
+                if version not in versions and self.pipeline.has_package_scripts(package_name, version):
+                    versions.append(version)
+        return versions
+
+
+    def start_version_discovery(self):
+        """
+        Refreshes stale version index entries without blocking startup. The dropdowns
+        already show cached versions, and are updated when the refresh finishes.
+        """
+        if not self.version_index:
+            return
+
+        git_urls = {package_name: self.package_store.get_git_url(package_name)
+                    for package_name in self.package_store}
+        self.version_index.refresh_in_background(git_urls, self.on_versions_discovered)
+
+
+    def on_versions_discovered(self, refreshed_versions):
+        for package_name in refreshed_versions:
+            if package_name not in self.package_items:
+                continue
+            dropdown_item = self.package_items[package_name].dropdown_item
+            dropdown_item.versions = self.get_dropdown_versions(package_name)
+            dpg.configure_item(dropdown_item.dropdown_id, items=dropdown_item.versions)
+        print(f"Discovered versions for {', '.join(refreshed_versions)}")
+
+
     def create_execute_button(self):
         if self.mode == Mode.CREATE_NEW:
             self.generate_button_id = dpg.add_button(label="Generate", callback=self.on_generate_clicked)
@@ -361,6 +380,7 @@ class PackageSelectorGUI:
 
 
     def on_dropdown_changed(self, sender, app_data, user_data):
+        self.package_items[user_data].dropdown_item.current_version = app_data
         self.update_dependencies()
 
 
@@ -372,6 +392,7 @@ class PackageSelectorGUI:
             self.selected_packages.add(package_name)
         else:
             self.selected_packages.discard(package_name)
+        self.package_items[package_name].checkbox_item.is_checked = app_data
         self.update_module_dependency_checkboxes(package_name)
         self.update_dependencies()
 
@@ -389,21 +410,31 @@ class PackageSelectorGUI:
             print(e)
             return
 
-        self.fetch_packages(self.get_checked_packages())
-        self.build_packages(self.get_checked_packages())
-        self.generate_package_info_lua()
+        # The pipeline has already reported which package failed.
+        if not self.pipeline.fetch_packages(self.get_checked_packages()):
+            self.set_ui_enabled(True)
+            return
+        self.pipeline.build_packages(self.get_checked_packages())
         dpg.set_value(self.status_text_id,f"{STATUS_TEXT_PREFIX} Creating folder structure...")
 
         self.solution_dir = Path(self.output_dir) / self.solution_name
-        self.build_sln_dir(self.solution_dir)
+        if not self.build_sln_dir(self.solution_dir):
+            return
+
+        # package_info.lua and the unity files point at absolute paths under the solution,
+        # so they're generated by a pipeline rooted at the new solution, not the template.
+        solution_pipeline = self.create_solution_pipeline(self.solution_dir)
+        solution_pipeline.generate_package_info_lua(self.get_checked_packages())
         self.execute_premake(self.solution_dir)
-        self.generate_package_manager_batch_script(self.solution_dir)
+        write_package_manager_batch_script(self.solution_dir)
 
 
     def on_update_clicked(self, sender, app_data, user_data):
-        self.fetch_packages(self.get_checked_packages())
-        self.build_packages(self.get_checked_packages())
-        self.generate_package_info_lua()
+        if not self.pipeline.fetch_packages(self.get_checked_packages()):
+            self.set_ui_enabled(True)
+            return
+        self.pipeline.build_packages(self.get_checked_packages())
+        self.pipeline.generate_package_info_lua(self.get_checked_packages())
         self.execute_premake(SLN_DIR)
 
 
@@ -435,241 +466,40 @@ class PackageSelectorGUI:
             safe_configure_item(package_item.checkbox_item.checkbox_id, enabled)
             safe_configure_item(package_item.dropdown_item.dropdown_id, enabled)
 
-    # If packages need building, build them.
-    def build_packages(self, checked_packages):
-        for package_name, version in checked_packages:
-            version = version.split('|')[1] if '|' in version else version
-            cmake_presets_dir = SUPPORTED_PACKAGES_DIR / package_name / version
-            cmake_presets_file = cmake_presets_dir / CMAKE_PRESETS_FILENAME
-            if os.path.isfile(cmake_presets_file):
-                print(f"Found CMakePresets.json for {package_name} at {cmake_presets_file}")
-                package_cache_path = self.get_package_cache_path()
-                repo_path = package_cache_path / package_name / version / package_name
-                self.do_execute_cmake(cmake_presets_file, repo_path, CMAKE_BUILD_COMMAND_RELEASE)
-                self.do_execute_cmake(cmake_presets_file, repo_path, CMAKE_BUILD_COMMAND_DEBUG)
-
-
-    def do_execute_cmake(self, preset_file_path, package_dir, build_command):
-        try:
-            if not os.path.isfile(preset_file_path):
-                raise FileNotFoundError(f"Preset file not found: {preset_file_path}")
-
-            shutil.copy2(preset_file_path, package_dir)
-            print(f"Copied {preset_file_path} to {package_dir}")
-
-            with tempfile.NamedTemporaryFile('w', delete=False, suffix='.bat') as batch_file:
-                batch_file.write('@echo off\n')
-                batch_file.write(f'call {VS_DEV_COMMAND}\n')
-                batch_file.write(f'cd /d "{package_dir}"\n')
-                batch_file.write(f'echo configuring {os.path.basename(package_dir)}\n')
-                batch_file.write(f'{CMAKE_CONFIGURE_COMMAND}\n')
-                batch_file.write(f'echo building {os.path.basename(package_dir)}\n')
-                batch_file.write(f'{build_command}\n')
-
-                batch_file_path = batch_file.name
-
-            os.system(f'cmd.exe /c "{batch_file_path}"')
-        except subprocess.CalledProcessError as e:
-            print(f"Error running Cmake: {e.stderr}")
-
-
-    def get_package_cache_path(self):
-        package_cache_path_str = os.getenv('PACKAGE_CACHE_PATH')
-        if not package_cache_path_str:
-            dpg.set_value(self.status_text_id,
-                          f"{STATUS_TEXT_ERROR_PREFIX} PACKAGE_CACHE_PATH env variable not set.")
-            raise PackageCacheNotSetError()
-        return Path(package_cache_path_str)
-
-    def fetch_packages(self, checked_packages):
-
-        package_cache_path = self.get_package_cache_path()
-
-        for package_name, version in checked_packages:
-            version = version.split('|')[1] if '|' in version else version
-            repo_path = package_cache_path / package_name / version / package_name
-            repo_url = self.package_store[package_name]['git_url']
-            print(f"attempting repo={package_name} version={version}")
-
-            if GitHelper.does_repo_exist(repo_path):
-                dpg.set_value(self.status_text_id,f"{STATUS_TEXT_PREFIX} Updating {package_name}...")
-                print(f"Repo exists at {repo_path}. Ensuring up to date.")
-                if GitHelper.is_correct_version(repo_path, version):
-                    GitHelper.reset_hard(repo_path)
-                    GitHelper.pull(repo_path)
-                else:
-                    GitHelper.checkout(repo_path, version)
-            else:
-                dpg.set_value(self.status_text_id,f"{STATUS_TEXT_PREFIX} Cloning {package_name}...")
-                GitHelper.clone(repo_path, repo_url)
-                dpg.set_value(self.status_text_id,f"{STATUS_TEXT_PREFIX} Checking out branch {version}...")
-                GitHelper.checkout(repo_path, version)
-
-
     def build_sln_dir(self, solution_dir):
-        # I'm gonna error here because I want the user to decide what to do.
-        # I don't want to just overwrite or delete their stuff.
+        """Returns whether the solution dir was created."""
         try:
-            if solution_dir.exists() and os.listdir(solution_dir):
-                dpg.set_value(self.status_text_id,
-                            f"{STATUS_TEXT_ERROR_PREFIX} Failed to create solution at {solution_dir}."
-                             " The destination must be empty.")
-                raise DirectoryAlreadyExistsError(solution_dir)
+            self.pipeline.create_solution_dir(solution_dir, self.solution_name)
         except DirectoryAlreadyExistsError:
+            dpg.set_value(self.status_text_id,
+                        f"{STATUS_TEXT_ERROR_PREFIX} Failed to create solution at {solution_dir}."
+                         " The destination must be empty.")
             self.set_ui_enabled(True)
-            return
+            return False
+        return True
 
-        solution_dir.mkdir(parents=True, exist_ok=True)
-        print("Creating directory at")
-
-        # These files are needed go properly generate and update project files.
-        shutil.copytree(SLN_DIR / 'premake', solution_dir / 'premake', dirs_exist_ok=True)
-        shutil.copy2(SLN_DIR / 'dependencies.json', solution_dir)
-        shutil.copy2(SLN_DIR / 'premake5.lua', solution_dir)
-        shutil.copytree(SLN_DIR / 'scripts', solution_dir / 'scripts', dirs_exist_ok=True)
-
-        # Might as well copy this over too, as it includes a lot of script/premake related paths.
-        #shutil.copy2(SLN_DIR / '.gitignore', solution_dir)
-        copy_modified_gitignore(SLN_DIR, solution_dir)
-
-        # Create settings.ini and Source directory
-        with open(solution_dir / 'settings.ini', 'w', encoding='utf-8') as file:
-            file.write("[DEFAULT]\n")
-            file.write("mode = UPDATE\n")
-            file.write(f"solution_name = {self.solution_name}\n")
-        (solution_dir / 'source').mkdir()
-
-        # Create a default project with the same name as the sln name.
-        default_project_dir = solution_dir / 'source' / self.solution_name
-        default_project_dir.mkdir()
-
-        main_cpp_file_path = default_project_dir / 'main.cpp'
-        with open(main_cpp_file_path, 'w', encoding='utf-8') as main_cpp_file:
-            main_cpp_file.write('#include <iostream>\n\n')
-            main_cpp_file.write('int main()\n{\n')
-            main_cpp_file.write('    return 0;\n')
-            main_cpp_file.write('}\n')
-
-    def json_to_lua(self, data, indent_level=0):
-        """
-        Recursively converts a Python dictionary or list (parsed from JSON)
-        into Lua table syntax as a string, with improved readability (indents and line breaks).
-        """
-        indent = " " * (indent_level * 4)  # 4 spaces per indent level
-        next_indent = " " * ((indent_level + 1) * 4)
-
-        if isinstance(data, dict):
-            # It's a dictionary, convert it to a Lua table with key-value pairs
-            lua_table = "{\n"
-            for key, value in data.items():
-                lua_table += f"{next_indent}{key} = {self.json_to_lua(value, indent_level + 1)},\n"
-            lua_table += indent + "}"
-            return lua_table
-        elif isinstance(data, list):
-            # It's a list, convert it to a Lua table with values
-            lua_array = "{\n"
-            for item in data:
-                lua_array += f"{next_indent}{self.json_to_lua(item, indent_level + 1)},\n"
-            lua_array += indent + "}"
-            return lua_array
-        elif isinstance(data, bool):
-            return "true" if data else "false"
-        else:
-            # It's a basic data type (string, number, etc.), return as a Lua-compatible value
-            if isinstance(data, str):
-                return f'"{data}"'
-            return str(data)
-
-
-    def generate_package_info_lua(self):
-        # Define the path for package_info.lua
-        package_info_lua_path = SLN_DIR / 'premake' / 'generated' / 'package_info.lua'
-        package_info_lua_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Building the dictionary for package info
-        packages_dict = {}
-        checked_packages = self.get_checked_packages()
-        for package_name, version in checked_packages:
-            clean_version = version.replace("git|", "")
-            package_data = self.package_store.get(package_name)
-
-            if package_data:
-                include_in_build = True
-                package_dict = {"version": clean_version}
-                if f"{package_name}_modules" in self.dependencies:
-                    package_dict["modules"] = self.dependencies[f"{package_name}_modules"]
-                    include_in_build = False
-                package_dict["include_in_build"] = include_in_build
-                packages_dict[package_name] = package_dict
-
-        # Convert the dictionary to a JSON string
-        package_info_json = json.dumps({"packages": packages_dict}, indent=4)
-
-        # Parse the JSON string into a Python object (dict or list)
-        parsed_json = json.loads(package_info_json)
-
-        # Convert the parsed JSON into Lua syntax
-        lua_content = f"return {self.json_to_lua(parsed_json)}\n"
-
-        # Write the content to package_info.lua
-        with open(package_info_lua_path, 'w', encoding='utf-8') as file:
-            file.write(lua_content)
+    def create_solution_pipeline(self, solution_dir):
+        """Returns a pipeline rooted at a solution created by build_sln_dir."""
+        config_parser = configparser.ConfigParser()
+        config_parser.read(solution_dir / 'settings.ini')
+
+        pipeline = PackagePipeline(solution_dir, status_callback=self.set_status_text)
+        pipeline.load_settings(config_parser)
+        pipeline.load_package_store()
+        pipeline.load_dependencies()
+        return pipeline
 
     def execute_premake(self, solution_dir):
-        os.chdir(solution_dir)
-        print(f"Project generated at {solution_dir}")
-        print(f"Locating Premake")
-        premake_executable = solution_dir / 'premake' / 'premake5.exe'
-        if premake_executable.exists():
-            try:
-                command = [
-                    str(premake_executable),
-                    f'--sln_dir={str(solution_dir)}',
-                    f'--sln_name={self.solution_name}',
-                    "vs2022"
-                ]
-
-                print("Running Premake with command:", " ".join(command))
-                result = subprocess.run(command, check=True, capture_output=True, text=True)
-
-                print(f"Premake output: {result.stdout}")
-            except subprocess.CalledProcessError as e:
-                print(f"Error running premake: {e.output}")
-                dpg.set_value(self.status_text_id, f"{STATUS_TEXT_ERROR_PREFIX} Error running premake.")
-        else:
-            print(f"Premake executable not found at {premake_executable}.")
-            dpg.set_value(self.status_text_id, f"{STATUS_TEXT_ERROR_PREFIX} Premake executable not found.")
-        dpg.set_value(self.status_text_id, "Done.")
+        if self.pipeline.execute_premake(solution_dir, self.solution_name):
+            dpg.set_value(self.status_text_id, "Done.")
         self.set_ui_enabled(True)
-        os.chdir(SLN_DIR)
-
-
-    def generate_package_manager_batch_script(self, solution_dir):
-        os.chdir(solution_dir)
-        try:
-            batch_file_path = solution_dir / 'run_bootstrapper.bat'
-            python_script_path = Path('scripts') / 'bootstrapper.py'
-            with open(batch_file_path, 'w') as batch_file:
-                batch_file.write(f'@echo off\n')
-                batch_file.write(f'python "{python_script_path}"\n')
-
-                # TODO: Keeping the command window open for logs. Maybe make this configurable.
-                batch_file.write(f'pause\n')
-
-            print(f"Batch file written at {batch_file_path}")
-
-        except Exception as e:
-            print(f"Error: {e}")
-
-        finally:
-            os.chdir(SLN_DIR)
 
 
     def get_checked_packages(self):
         checked_packages = [
-            (item.package_name, dpg.get_value(item.dropdown_item.dropdown_id))
+            (item.package_name, item.dropdown_item.current_version)
             for item in self.package_items.values()
-            if dpg.get_value(item.checkbox_item.checkbox_id)
+            if item.checkbox_item.is_checked
         ]
         return checked_packages
 
@@ -693,19 +523,15 @@ class PackageSelectorGUI:
         # Is it the most efficient? No, but we're talking about dozens of dependencies at most.
         updated_dependencies = {}
 
+        # Reads the widget state we mirror rather than asking dearpygui for every widget.
         for package_name, package_item in self.package_items.items():
-            if dpg.get_value(package_item.checkbox_item.checkbox_id):
-                dropdown_value = dpg.get_value(package_item.dropdown_item.dropdown_id)
-                updated_dependencies[package_name] = dropdown_value
+            if package_item.checkbox_item.is_checked:
+                updated_dependencies[package_name] = package_item.dropdown_item.current_version
                 # Add the selected modules for SFML
-                if "module_definitions" in self.package_store[package_name]:
-                    selected_modules = []
-                    for module in self.package_store[package_name]["module_definitions"]:
-                        module_name = module
-                        module_checkbox_id = self.get_module_checkbox_id_by_name(
-                            self.module_dependency_helpers[package_name], module_name)
-                        if dpg.get_value(module_checkbox_id):
-                            selected_modules.append(module_name)
+                if self.package_store.has_flag(package_name, FLAG_MODULES):
+                    selected_modules = [module_name for module_name, module_item
+                                        in self.module_items[package_name].items()
+                                        if module_item.is_checked]
 
                     if selected_modules:
                         updated_dependencies[f"{package_name}_modules"] = selected_modules
@@ -726,7 +552,31 @@ def set_disabled_theme(component, theme):
         dpg.add_theme_color(dpg.mvThemeCol_ButtonActive, DISABLED_BUTTON_ACTIVE_COLOR, category=dpg.mvThemeCat_Core)
 
 
+def run_watch_mode():
+    """
+    Headless counterpart of the Update button. Only makes sense from a generated solution,
+    since the template itself has no solution to keep up to date.
+    """
+    config_parser = configparser.ConfigParser()
+    config_parser.read(SLN_DIR / 'settings.ini')
+    if config_parser.get('DEFAULT', 'mode', fallback="CREATE_NEW") != Mode.UPDATE.name:
+        print(f"{STATUS_TEXT_ERROR_PREFIX} Watch mode only runs from a generated solution.")
+        return
+
+    pipeline = PackagePipeline(SLN_DIR)
+    pipeline.load_settings(config_parser)
+    pipeline.load_package_store()
+    pipeline.load_dependencies()
+
+    solution_name = config_parser.get('DEFAULT', 'solution_name', fallback="default")
+    PackageWatcher(pipeline, solution_name).run()
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'watch':
+        run_watch_mode()
+        return
+
     dpg.create_context()
     gui = PackageSelectorGUI()
 
@@ -0,0 +1,103 @@
+"""
+This module turns the timing log Ninja leaves in a build dir (.ninja_log) into a report of
+the slowest translation units and targets, so we can see what dominates a package's build.
+
+Ninja appends to the same log on every build, so callers note where the log ended before
+building and only read what was added after that point.
+"""
+
+
+import json
+from pathlib import Path
+
+NINJA_LOG_FILENAME = '.ninja_log'
+BUILD_LOGS_DIRNAME = 'logs'
+REPORTS_DIRNAME = 'reports'
+DEFAULT_HOTSPOT_COUNT = 20
+
+OBJECT_SUFFIXES = ('.obj', '.o')
+
+
+def get_ninja_log_offset(build_dir):
+    """Returns the current end of the build dir's ninja log, or 0 if there isn't one yet."""
+    ninja_log_path = Path(build_dir) / NINJA_LOG_FILENAME
+    return ninja_log_path.stat().st_size if ninja_log_path.is_file() else 0
+
+
+def read_ninja_log(build_dir, offset=0):
+    """
+    Reads ninja log entries written after offset.
+
+    Args:
+        build_dir (Path): The build dir containing .ninja_log.
+        offset (int): Byte offset returned by get_ninja_log_offset before the build.
+
+    Returns:
+        dict[str, int] of output path to build duration in milliseconds. If an output was
+        built more than once, the last build wins.
+    """
+    ninja_log_path = Path(build_dir) / NINJA_LOG_FILENAME
+    if not ninja_log_path.is_file():
+        return {}
+
+    with open(ninja_log_path, 'rb') as file:
+        # Ninja occasionally rewrites the log to drop dead entries. If it shrank, the old
+        # offset is meaningless and the whole log is the best we have.
+        file.seek(0, 2)
+        if file.tell() < offset:
+            offset = 0
+        file.seek(offset)
+        content = file.read().decode('utf-8', errors='replace')
+
+    durations = {}
+    for line in content.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        columns = line.split('\t')
+        if len(columns) < 4:
+            continue
+        start_ms, end_ms, output = int(columns[0]), int(columns[1]), columns[3]
+        durations[output] = end_ms - start_ms
+    return durations
+
+
+def build_hotspot_report(durations, package_name, configuration, count=DEFAULT_HOTSPOT_COUNT):
+    """
+    Splits durations into translation units (object files) and everything else (libs,
+    custom commands), keeping the slowest of each.
+
+    Returns:
+        dict ready to be written as json.
+    """
+    def slowest(outputs):
+        ranked = sorted(outputs, key=lambda output: durations[output], reverse=True)
+        return [{"output": output, "ms": durations[output]} for output in ranked[:count]]
+
+    translation_units = [output for output in durations if output.endswith(OBJECT_SUFFIXES)]
+    targets = [output for output in durations if not output.endswith(OBJECT_SUFFIXES)]
+
+    return {
+        "package": package_name,
+        "configuration": configuration,
+        "step_count": len(durations),
+        "total_ms": sum(durations.values()),
+        "slowest_translation_units": slowest(translation_units),
+        "slowest_targets": slowest(targets),
+    }
+
+
+def write_hotspot_report(report, build_dir):
+    """Writes the report to <build_dir>/reports/<configuration>-hotspots.json."""
+    reports_dir = Path(build_dir) / REPORTS_DIRNAME
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    report_path = reports_dir / f"{report['configuration']}-hotspots.json"
+    with open(report_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=4)
+    return report_path
+
+
+def print_hotspot_summary(report, count=5):
+    print(f"{report['package']} {report['configuration']}: {report['step_count']} steps,"
+          f" {report['total_ms'] / 1000:.1f}s of compile/link time")
+    for hotspot in report["slowest_translation_units"][:count]:
+        print(f"    {hotspot['ms'] / 1000:7.2f}s  {hotspot['output']}")
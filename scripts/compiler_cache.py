@@ -0,0 +1,146 @@
+"""
+This module hooks a compiler cache (ccache or sccache) into the presets used to build
+packages, and reads the cache's counters so each build can report how many compilations
+it got for free. With a shared cache dir, rebuilding Debug after Release or switching
+between nearby versions of a package mostly hits the cache.
+"""
+
+
+import copy
+import json
+import os
+import subprocess
+from dataclasses import dataclass
+
+SUPPORTED_COMPILER_LAUNCHERS = ('ccache', 'sccache')
+
+COMPILER_CACHE_DIR_ENV = {
+    'ccache': 'CCACHE_DIR',
+    'sccache': 'SCCACHE_DIR',
+}
+
+# CMAKE_MSVC_DEBUG_INFORMATION_FORMAT is silently ignored before this.
+MSVC_DEBUG_INFORMATION_FORMAT_MIN_CMAKE_VERSION = (3, 25, 0)
+
+
+class UnsupportedCompilerLauncherError(Exception):
+    def __init__(self, launcher):
+        self.message = (f"Unsupported compiler launcher '{launcher}'."
+                        f" Expected one of: {', '.join(SUPPORTED_COMPILER_LAUNCHERS)}")
+        super().__init__(self.message)
+
+
+@dataclass
+class CompilerCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    def __sub__(self, other):
+        return CompilerCacheStats(self.hits - other.hits, self.misses - other.misses)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def inject_compiler_launcher(presets, launcher, cache_dir=None, base_dir=None):
+    """
+    Adds the launcher to every configure preset, and raises the presets' cmakeMinimumRequired
+    to a version that honors the debug info format the cache depends on.
+
+    Args:
+        presets (dict): Parsed CMakePresets.json, modified in place.
+        launcher (str): ccache or sccache.
+        cache_dir (str): Optional shared cache directory.
+        base_dir (str): Optional directory ccache rewrites to relative paths, so the same
+            sources checked out under different version dirs still hit.
+    """
+    if launcher not in SUPPORTED_COMPILER_LAUNCHERS:
+        raise UnsupportedCompilerLauncherError(launcher)
+
+    for configure_preset in presets.get('configurePresets', []):
+        cache_variables = configure_preset.setdefault('cacheVariables', {})
+        cache_variables['CMAKE_C_COMPILER_LAUNCHER'] = launcher
+        cache_variables['CMAKE_CXX_COMPILER_LAUNCHER'] = launcher
+
+        # MSVC's default /Zi writes every object's debug info into one shared pdb, which
+        # can't be cached. Embedding it in the object (/Z7) can.
+        cache_variables['CMAKE_POLICY_DEFAULT_CMP0141'] = 'NEW'
+        cache_variables['CMAKE_MSVC_DEBUG_INFORMATION_FORMAT'] = 'Embedded'
+
+        environment = configure_preset.setdefault('environment', {})
+        if cache_dir:
+            environment[COMPILER_CACHE_DIR_ENV[launcher]] = str(cache_dir)
+        if base_dir and launcher == 'ccache':
+            environment['CCACHE_BASEDIR'] = str(base_dir)
+
+    require_cmake_version(presets, MSVC_DEBUG_INFORMATION_FORMAT_MIN_CMAKE_VERSION)
+
+
+def require_cmake_version(presets, version):
+    """Raises the presets' cmakeMinimumRequired to version. Never lowers it."""
+    current = presets.get('cmakeMinimumRequired', {})
+    current_version = tuple(current.get(part, 0) for part in ('major', 'minor', 'patch'))
+    if current_version < version:
+        presets['cmakeMinimumRequired'] = dict(zip(('major', 'minor', 'patch'), version))
+
+
+def strip_compiler_cache_environment(presets):
+    """
+    Returns a copy of the presets without the environment inject_compiler_launcher adds.
+    Those are per-machine paths that don't change what gets built, so they must not end
+    up in anything that identifies build outputs across machines.
+    """
+    machine_specific_names = set(COMPILER_CACHE_DIR_ENV.values()) | {'CCACHE_BASEDIR'}
+    stripped_presets = copy.deepcopy(presets)
+    for configure_preset in stripped_presets.get('configurePresets', []):
+        environment = configure_preset.get('environment')
+        if environment is None:
+            continue
+        for name in machine_specific_names:
+            environment.pop(name, None)
+        if not environment:
+            del configure_preset['environment']
+    return stripped_presets
+
+
+def read_compiler_cache_stats(launcher, cache_dir=None):
+    """
+    Returns the launcher's cumulative counters, or None if they couldn't be read (for
+    example because the launcher isn't installed).
+    """
+    env = dict(os.environ)
+    if cache_dir:
+        env[COMPILER_CACHE_DIR_ENV[launcher]] = str(cache_dir)
+
+    if launcher == 'ccache':
+        command = ['ccache', '--print-stats']
+    else:
+        command = ['sccache', '--show-stats', '--stats-format', 'json']
+
+    try:
+        result = subprocess.run(command, check=True, capture_output=True, text=True, env=env)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Could not read {launcher} stats: {e}")
+        return None
+
+    if launcher == 'ccache':
+        # Machine readable output is one "<counter>\t<value>" per line.
+        counters = {}
+        for line in result.stdout.splitlines():
+            name, _, value = line.partition('\t')
+            if value.strip().isdigit():
+                counters[name] = int(value)
+        return CompilerCacheStats(
+            hits=counters.get('direct_cache_hit', 0) + counters.get('preprocessed_cache_hit', 0),
+            misses=counters.get('cache_miss', 0))
+
+    try:
+        stats = json.loads(result.stdout)['stats']
+    except (json.JSONDecodeError, KeyError) as e:
+        print(f"Could not parse sccache stats: {e}")
+        return None
+    return CompilerCacheStats(
+        hits=sum(stats.get('cache_hits', {}).get('counts', {}).values()),
+        misses=sum(stats.get('cache_misses', {}).get('counts', {}).values()))
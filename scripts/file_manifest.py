@@ -0,0 +1,92 @@
+"""
+This module precomputes the file lists premake would otherwise glob out of package
+checkouts on every run. A manifest only depends on the checked out commit and on the spec
+describing what to collect, so it's computed once and cached next to the checkout.
+
+A spec comes from the "manifest" entry in a package's package.json, with paths relative
+to the repo checkout:
+
+    "manifest": {
+        "include_dirs": ["include"],
+        "files": [
+            {"dir": "include", "extensions": [".h"]},
+            {"dir": "src", "extensions": [".cpp"]}
+        ]
+    }
+"""
+
+
+import json
+import os
+import threading
+from pathlib import Path
+from git_helper import GitHelper
+
+FILE_MANIFEST_CACHE_FILENAME = 'file_manifest.json'
+
+
+def compute_file_manifest(repo_path, spec):
+    """
+    Walks the checkout and collects everything the spec asks for.
+
+    Args:
+        repo_path (Path): The package checkout the spec's paths are relative to.
+        spec (dict): The package's manifest spec.
+
+    Returns:
+        dict with sorted absolute "include_dirs" and "files", as posix paths.
+    """
+    repo_path = Path(repo_path)
+    include_dirs = [(repo_path / include_dir).resolve().as_posix()
+                    for include_dir in spec.get("include_dirs", [])]
+
+    files = set()
+    for file_spec in spec.get("files", []):
+        extensions = tuple(file_spec["extensions"])
+        for root, dirnames, filenames in os.walk(repo_path / file_spec["dir"]):
+            # Never descend into .git and friends.
+            dirnames[:] = [dirname for dirname in dirnames if not dirname.startswith('.')]
+            for filename in filenames:
+                if filename.endswith(extensions):
+                    files.add(Path(root, filename).resolve().as_posix())
+
+    return {
+        "include_dirs": include_dirs,
+        "files": sorted(files),
+    }
+
+
+def get_file_manifest(repo_path, spec):
+    """
+    Returns the manifest for the checkout, reusing the cached one when neither the
+    commit nor the spec changed since it was computed.
+
+    The cache lives next to the checkout, e.g. <cache>/spdlog/v1.12.0/file_manifest.json.
+    """
+    repo_path = Path(repo_path)
+    cache_path = repo_path.parent / FILE_MANIFEST_CACHE_FILENAME
+    commit = GitHelper.get_head_commit(repo_path)
+
+    if commit and cache_path.is_file():
+        try:
+            with open(cache_path, encoding='utf-8') as file:
+                cached = json.load(file)
+            if cached["commit"] == commit and cached["spec"] == spec:
+                print(f"Using cached file manifest for {repo_path} at {commit}")
+                return cached["manifest"]
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"Ignoring unreadable file manifest cache {cache_path}: {e}")
+
+    print(f"Computing file manifest for {repo_path}")
+    manifest = compute_file_manifest(repo_path, spec)
+
+    # Without a commit there's nothing to validate the cache against next time.
+    if commit:
+        # Solutions generated in parallel can share a checkout, so never leave a half
+        # written cache where another one might read it.
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"commit": commit, "spec": spec, "manifest": manifest}, file, indent=4)
+        os.replace(temp_path, cache_path)
+
+    return manifest
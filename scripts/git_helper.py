@@ -1,5 +1,8 @@
 import os
+import shutil
 import subprocess
+import threading
+import time
 
 class GitHelper:
     @staticmethod
@@ -37,11 +40,115 @@ class GitHelper:
             os.makedirs(repo_path, exist_ok=True)
         return GitHelper.run_git_command(repo_path, ["clone", repo_url, repo_path])
 
+    @staticmethod
+    def ls_remote(repo_url):
+        """List the tags and branches of a remote without cloning it."""
+        return GitHelper.run_git_command(None, ["ls-remote", "--tags", "--heads",
+                                                "--sort=-v:refname", repo_url])
+
+    @staticmethod
+    def probe_remote(repo_url, timeout):
+        """
+        Time how long the remote takes to answer a request for its HEAD.
+
+        Returns:
+            tuple of (seconds, None) if the remote answered, or (None, reason) if it failed
+            or timed out.
+        """
+        start = time.monotonic()
+        try:
+            subprocess.run(
+                ["git", "ls-remote", repo_url, "HEAD"],
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors='replace',
+                timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            return None, f"did not answer within {timeout}s"
+        except subprocess.CalledProcessError as e:
+            error_lines = e.stderr.strip().splitlines()
+            return None, error_lines[-1] if error_lines else f"git exited with {e.returncode}"
+        except OSError as e:
+            return None, str(e)
+        return time.monotonic() - start, None
+
+    @staticmethod
+    def clone_with_stall_timeout(repo_path, repo_url, stall_timeout):
+        """
+        Clone a repository, giving up if git reports no progress for stall_timeout seconds.
+        A clone that fails or stalls leaves nothing behind at repo_path.
+
+        Returns:
+            bool indicating whether the clone completed.
+        """
+        if os.path.exists(repo_path) and os.listdir(repo_path):
+            print(f"Cannot clone into non-empty directory {repo_path}")
+            return False
+
+        print(f"cloning {repo_url} into {repo_path}")
+        process = subprocess.Popen(
+            ["git", "clone", "--progress", repo_url, str(repo_path)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+        # git writes progress to stderr. Any output at all counts as the transfer moving.
+        last_activity = [time.monotonic()]
+        stderr_tail = []
+
+        def watch_progress():
+            for chunk in iter(lambda: process.stderr.read1(4096), b''):
+                last_activity[0] = time.monotonic()
+                stderr_tail[:] = (stderr_tail + [chunk])[-8:]
+
+        watcher = threading.Thread(target=watch_progress, daemon=True)
+        watcher.start()
+
+        stalled = False
+        while process.poll() is None:
+            if time.monotonic() - last_activity[0] > stall_timeout:
+                stalled = True
+                process.kill()
+                process.wait()
+                break
+            time.sleep(0.1)
+        watcher.join(timeout=1)
+
+        if process.returncode == 0 and not stalled:
+            return True
+
+        if stalled:
+            print(f"Clone of {repo_url} stalled for {stall_timeout}s. Aborted.")
+        else:
+            error_output = b''.join(stderr_tail).decode(errors='replace').strip()
+            print(f"Error cloning {repo_url}: {error_output}")
+        shutil.rmtree(repo_path, ignore_errors=True)
+        return False
+
     @staticmethod
     def fetch(repo_path):
         """Fetch updates from the remote repository."""
         return GitHelper.run_git_command(repo_path, ["fetch"])
 
+    @staticmethod
+    def bundle_create(repo_path, bundle_path):
+        """Pack every ref of the repository into a single bundle file."""
+        return GitHelper.run_git_command(repo_path, ["bundle", "create", str(bundle_path), "--all"])
+
+    @staticmethod
+    def get_remote_url(repo_path, remote="origin"):
+        """Return the url of the given remote, or None if it has none."""
+        output = GitHelper.run_git_command(repo_path, ["remote", "get-url", remote])
+        return output.strip() if output else None
+
+    @staticmethod
+    def set_remote_url(repo_path, repo_url, remote="origin"):
+        """Point the given remote at repo_url."""
+        return GitHelper.run_git_command(repo_path, ["remote", "set-url", remote, repo_url])
+
     @staticmethod
     def checkout(repo_path, branch):
         """Checkout a specific branch in the given repository."""
@@ -57,6 +164,12 @@ class GitHelper:
         """Pull updates from the remote repository into the given path."""
         return GitHelper.run_git_command(repo_path, ["pull"])
 
+    @staticmethod
+    def get_head_commit(repo_path):
+        """Return the full hash of the commit currently checked out, or None on failure."""
+        output = GitHelper.run_git_command(repo_path, ["rev-parse", "HEAD"])
+        return output.strip() if output else None
+
     @staticmethod
     def is_correct_version(repo_path, version):
         current_commit = GitHelper.run_git_command(repo_path, ["rev-parse", "HEAD"]).strip()
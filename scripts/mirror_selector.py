@@ -0,0 +1,166 @@
+"""
+This module picks which of a package's mirrors to clone from. Every mirror is probed
+for latency, and what each clone actually achieved is remembered, so over time the
+fastest healthy source gets picked first. A clone that stops making progress is killed
+and the next mirror is tried.
+
+Mirrors are listed in a package's package.json, alongside the primary git_url:
+
+    "mirrors": ["https://git.internal/mirrors/SFML.git"]
+"""
+
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from git_helper import GitHelper
+
+MIRROR_STATS_FILENAME = 'mirror_stats.json'
+
+DEFAULT_PROBE_TIMEOUT_SECONDS = 10
+DEFAULT_STALL_TIMEOUT_SECONDS = 60
+
+# Used to weigh latency against throughput when ranking. Roughly a mid-sized package.
+REFERENCE_TRANSFER_BYTES = 50 * 1024 * 1024
+
+# How much a new throughput measurement moves the remembered value.
+THROUGHPUT_SMOOTHING = 0.5
+
+
+def get_directory_size(directory):
+    total_size = 0
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            file_path = os.path.join(root, filename)
+            if not os.path.islink(file_path):
+                total_size += os.path.getsize(file_path)
+    return total_size
+
+
+class MirrorStats:
+    """Latency and throughput measurements per url, persisted between runs."""
+    def __init__(self, stats_path):
+        self.stats_path = Path(stats_path)
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.stats_path, encoding='utf-8') as file:
+                self.entries = json.load(file)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            print(f"Ignoring unreadable mirror stats {self.stats_path}: {e}")
+
+    def save(self):
+        with self._lock:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.stats_path, 'w', encoding='utf-8') as file:
+                json.dump(self.entries, file, indent=4)
+
+    def _entry(self, url):
+        return self.entries.setdefault(url, {'latency': None, 'throughput': None, 'failures': 0})
+
+    def record_probe(self, url, latency):
+        """
+        A failed probe counts as a failure. A successful one halves the failure count, so
+        a mirror that failed briefly gets ranked by speed again, while one that keeps failing
+        stays behind for a few runs.
+        """
+        with self._lock:
+            entry = self._entry(url)
+            entry['latency'] = latency
+            if latency is None:
+                entry['failures'] += 1
+            else:
+                entry['failures'] //= 2
+
+    def record_transfer(self, url, transferred_bytes, seconds):
+        throughput = transferred_bytes / max(seconds, 0.001)
+        with self._lock:
+            entry = self._entry(url)
+            if entry['throughput'] is None:
+                entry['throughput'] = throughput
+            else:
+                entry['throughput'] += THROUGHPUT_SMOOTHING * (throughput - entry['throughput'])
+            entry['failures'] = 0
+
+    def record_failure(self, url):
+        with self._lock:
+            self._entry(url)['failures'] += 1
+
+    def rank_key(self, url):
+        """
+        Sorts mirrors with recent failures last, then by the estimated time to clone a
+        reference-sized package. Mirrors we've never cloned from are assumed to be fast so
+        they get a chance to be measured.
+        """
+        with self._lock:
+            entry = self._entry(url)
+            latency = entry['latency'] or 0
+            throughput = entry['throughput']
+            failures = entry['failures']
+        transfer_seconds = REFERENCE_TRANSFER_BYTES / throughput if throughput else 0
+        return (failures, latency + transfer_seconds)
+
+
+class MirrorSelector:
+    def __init__(self, stats: MirrorStats,
+                 probe_timeout=DEFAULT_PROBE_TIMEOUT_SECONDS,
+                 stall_timeout=DEFAULT_STALL_TIMEOUT_SECONDS):
+        self.stats = stats
+        self.probe_timeout = probe_timeout
+        self.stall_timeout = stall_timeout
+
+    def rank(self, urls):
+        """
+        Probes every url in parallel and orders the ones that answered from fastest to
+        slowest expected clone.
+
+        Returns:
+            list[str] of healthy urls, best first.
+        """
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            probe_results = list(executor.map(
+                lambda url: GitHelper.probe_remote(url, self.probe_timeout), urls))
+
+        healthy_urls = []
+        for url, (latency, error) in zip(urls, probe_results):
+            self.stats.record_probe(url, latency)
+            if latency is None:
+                print(f"Mirror {url} failed its probe: {error}")
+            else:
+                print(f"Mirror {url} answered in {latency:.2f}s.")
+                healthy_urls.append(url)
+
+        return sorted(healthy_urls, key=self.stats.rank_key)
+
+    def clone(self, repo_path, urls):
+        """
+        Clones from the best mirror, falling back to the next one if a clone fails or
+        stalls for longer than stall_timeout.
+
+        Args:
+            repo_path (Path): Where to clone to.
+            urls (list[str]): The package's primary url and its mirrors.
+
+        Returns:
+            The url that was cloned from, or None if every mirror failed.
+        """
+        ranked_urls = self.rank(urls)
+        try:
+            for url in ranked_urls:
+                start = time.monotonic()
+                if GitHelper.clone_with_stall_timeout(repo_path, url, self.stall_timeout):
+                    self.stats.record_transfer(url, get_directory_size(Path(repo_path) / '.git'),
+                                               time.monotonic() - start)
+                    print(f"Cloned {repo_path} from {url}")
+                    return url
+                self.stats.record_failure(url)
+        finally:
+            self.stats.save()
+
+        print(f"Every mirror failed for {repo_path}. Tried {', '.join(urls)}")
+        return None
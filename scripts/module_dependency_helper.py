@@ -17,6 +17,30 @@ class ModuleState:
     module_id: int = 0
 
 
+def resolve_required_modules(module_definitions: dict[str, list[str]], selected_modules: list[str]) -> set[str]:
+    """
+    Returns the selected modules plus everything they depend on, directly or not.
+
+    Args:
+        module_definitions (dict[str, list[str]]): Module name to the modules it depends on.
+        selected_modules (list[str]): The modules the user asked for.
+
+    Returns:
+        set[str] of every module that has to be built.
+    """
+    required_modules = set()
+    pending_modules = list(selected_modules)
+    while pending_modules:
+        module_name = pending_modules.pop()
+        if module_name in required_modules:
+            continue
+        if module_name not in module_definitions:
+            raise AssertionError(f"'{module_name}' not found in module_definitions.")
+        required_modules.add(module_name)
+        pending_modules.extend(module_definitions[module_name])
+    return required_modules
+
+
 class ModuleDependencyHelper:
     def __init__(self, module_states: list[ModuleState]):
         self.modules: dict[str, ModuleState] = {}
@@ -32,7 +56,7 @@ class ModuleDependencyHelper:
         self.modules[module_name].module_id = module_id
 
 
-    def set_module_checked_state_by_name(self, name: str, is_checked: bool):
+    def set_module_checked_state_by_name(self, name: str, is_checked: bool) -> list[ModuleState]:
         """
         Given a module name, sets its state to is_checked and updates the dependency
         graph, making cascading changes to affected dependencies.
@@ -41,9 +65,14 @@ class ModuleDependencyHelper:
             name (str): the name of the module to set the checked state of
 
         Returns:
-            None
+            list[ModuleState] of every module whose checked or enabled state changed,
+            including the module itself. Callers only need to update these.
         """
+        previous_states = {module_name: (module_state.is_checked, module_state.is_enabled)
+                           for module_name, module_state in self.modules.items()}
         self._update_module_state(name, is_checked)
+        return [module_state for module_name, module_state in self.modules.items()
+                if previous_states[module_name] != (module_state.is_checked, module_state.is_enabled)]
 
 
 
@@ -0,0 +1,161 @@
+"""
+This module packs the package cache entries a solution depends on into one archive, and
+seeds a package cache from such an archive without touching the network. Each checkout is
+stored as a git bundle along with whatever build outputs it had, so bringing up a fresh or
+air-gapped machine is a single file copy followed by:
+
+    python scripts/package_archive.py import packages.tar
+
+fetch_packages then finds every package already in place. To create the archive:
+
+    python scripts/package_archive.py export packages.tar
+"""
+
+
+import argparse
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+from artifact_cache import ARTIFACT_SUBDIRS, CMAKE_BUILD_DIRNAME
+from git_helper import GitHelper
+from package_pipeline import clean_version, get_selected_packages
+
+SLN_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+DEPENDENCIES_PATH = SLN_DIR / 'dependencies.json'
+ARCHIVE_MANIFEST_FILENAME = 'archive_manifest.json'
+
+
+def export_package_archive(dependencies_path, package_cache_path, archive_path):
+    """
+    Writes a bundle of every checkout dependencies_path refers to, plus its build outputs,
+    into archive_path.
+
+    Returns:
+        list[str] of packages that were exported.
+    """
+    with open(dependencies_path, encoding='utf-8') as file:
+        dependencies = json.load(file)
+
+    exported = []
+    with tempfile.TemporaryDirectory(prefix='package-archive-') as temp_dir:
+        staging_dir = Path(temp_dir)
+        manifest = {"packages": []}
+        for package_name, version in get_selected_packages(dependencies):
+            version = clean_version(version)
+            repo_path = Path(package_cache_path) / package_name / version / package_name
+            if not GitHelper.does_repo_exist(repo_path):
+                print(f"Skipping {package_name} {version}. Not in the package cache at {repo_path}")
+                continue
+
+            entry_dir = Path(package_name) / version
+            (staging_dir / entry_dir).mkdir(parents=True)
+            bundle_path = entry_dir / f"{package_name}.bundle"
+            print(f"Bundling {package_name} {version}")
+            if GitHelper.bundle_create(repo_path, staging_dir / bundle_path) is None:
+                print(f"Failed to bundle {package_name} {version}.")
+                continue
+
+            artifacts = []
+            for subdir in ARTIFACT_SUBDIRS:
+                artifact_dir = repo_path / CMAKE_BUILD_DIRNAME / subdir
+                if artifact_dir.is_dir():
+                    shutil.copytree(artifact_dir, staging_dir / entry_dir / CMAKE_BUILD_DIRNAME / subdir)
+                    artifacts.append(subdir)
+
+            manifest["packages"].append({
+                "name": package_name,
+                "version": version,
+                "git_url": GitHelper.get_remote_url(repo_path),
+                "bundle": bundle_path.as_posix(),
+                "artifacts": artifacts,
+            })
+            exported.append(package_name)
+
+        with open(staging_dir / ARCHIVE_MANIFEST_FILENAME, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=4)
+
+        # Bundles are already compressed, so a plain tar is just as small and much faster.
+        with tarfile.open(archive_path, 'w') as archive:
+            for item in sorted(staging_dir.iterdir()):
+                archive.add(item, arcname=item.name)
+
+    print(f"Exported {len(exported)} packages to {archive_path}")
+    return exported
+
+
+def import_package_archive(archive_path, package_cache_path):
+    """
+    Seeds package_cache_path from an archive made by export_package_archive. Checkouts
+    that already exist are left alone.
+
+    Returns:
+        list[str] of packages that were imported.
+    """
+    imported = []
+    with tempfile.TemporaryDirectory(prefix='package-archive-') as temp_dir:
+        staging_dir = Path(temp_dir)
+        with tarfile.open(archive_path, 'r') as archive:
+            archive.extractall(staging_dir, filter='data')
+
+        with open(staging_dir / ARCHIVE_MANIFEST_FILENAME, encoding='utf-8') as file:
+            manifest = json.load(file)
+
+        for package in manifest["packages"]:
+            package_name = package["name"]
+            version = package["version"]
+            repo_path = Path(package_cache_path) / package_name / version / package_name
+            if GitHelper.does_repo_exist(repo_path):
+                print(f"Skipping {package_name} {version}. Already in the package cache.")
+                continue
+
+            print(f"Importing {package_name} {version}")
+            if GitHelper.clone(repo_path, staging_dir / package["bundle"]) is None:
+                print(f"Failed to clone {package_name} from its bundle.")
+                continue
+
+            # Later fetches should go to the real remote, not the bundle we cloned from.
+            if package["git_url"]:
+                GitHelper.set_remote_url(repo_path, package["git_url"])
+            if GitHelper.checkout(repo_path, version) is None:
+                # Leaving the checkout behind would make fetch_packages use the wrong version.
+                print(f"Failed to check out {package_name} {version}. The bundle doesn't contain it.")
+                shutil.rmtree(repo_path, ignore_errors=True)
+                continue
+
+            for subdir in package["artifacts"]:
+                shutil.copytree(staging_dir / package_name / version / CMAKE_BUILD_DIRNAME / subdir,
+                                repo_path / CMAKE_BUILD_DIRNAME / subdir, dirs_exist_ok=True)
+            imported.append(package_name)
+
+    print(f"Imported {len(imported)} packages into {package_cache_path}")
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or import the package cache for offline use.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help="Pack the cached packages a solution uses.")
+    export_parser.add_argument('archive', help="Archive file to write.")
+    export_parser.add_argument('--dependencies', default=str(DEPENDENCIES_PATH),
+                               help="dependencies.json listing the packages to export.")
+
+    import_parser = subparsers.add_parser('import', help="Seed the package cache from an archive.")
+    import_parser.add_argument('archive', help="Archive file to read.")
+    args = parser.parse_args()
+
+    package_cache_path = os.getenv('PACKAGE_CACHE_PATH')
+    if not package_cache_path:
+        parser.error("The 'PACKAGE_CACHE_PATH' environment variable is not set.")
+
+    if args.command == 'export':
+        export_package_archive(args.dependencies, package_cache_path, args.archive)
+    elif args.command == 'import':
+        import_package_archive(args.archive, package_cache_path)
+
+
+if __name__ == "__main__":
+    main()
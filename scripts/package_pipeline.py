@@ -0,0 +1,705 @@
+"""
+This module runs the stages that turn dependencies.json into a generated solution: fetching
+packages into the package cache, building the ones that need it, writing package_info.lua
+and running premake. It has no UI of its own, so the GUI and the headless modes (such as
+watch) share it. Progress is reported through a status callback.
+"""
+
+
+from artifact_cache import (ArtifactCache, ArtifactKey, ARTIFACT_SUBDIRS, CMAKE_BUILD_DIRNAME,
+                            clear_artifact_marker, has_artifact_marker, hash_json)
+from build_report import (BUILD_LOGS_DIRNAME, build_hotspot_report, get_ninja_log_offset,
+                          print_hotspot_summary, read_ninja_log, write_hotspot_report)
+from compiler_cache import inject_compiler_launcher, read_compiler_cache_stats, strip_compiler_cache_environment
+from file_manifest import get_file_manifest
+from git_helper import GitHelper
+import collections
+import functools
+import gzip
+import json
+from mirror_selector import MirrorSelector, MirrorStats, MIRROR_STATS_FILENAME
+import os
+from package_store import PackageStore, FLAG_HEADER_ONLY, PACKAGE_INDEX_FILENAME
+from pathlib import Path
+import re
+import shutil
+import subprocess
+import tempfile
+from unity_build import UnityBuildGenerator, find_sources
+from module_dependency_helper import resolve_required_modules
+
+# TODO: This needs to be configurable.
+#commands
+VS_DEV_COMMAND = r'"C:\Program Files\Microsoft Visual Studio\2022\Professional\VC\Auxiliary\Build\vcvars64.bat"'
+
+# First command: Configure the project using the default preset
+CMAKE_CONFIGURE_COMMAND = f'cmake --preset default'
+
+# Second command: Build the project using the release preset
+CMAKE_BUILD_COMMAND_RELEASE = f'cmake --build --preset release'
+
+# Third command: Build the project using the debug preset
+CMAKE_BUILD_COMMAND_DEBUG = f'cmake --build --preset debug'
+
+CMAKE_BUILD_COMMANDS = {
+    'Release': CMAKE_BUILD_COMMAND_RELEASE,
+    'Debug': CMAKE_BUILD_COMMAND_DEBUG,
+}
+
+# Overrides the generator in the presets we ship. Ninja leaves a .ninja_log with per-step
+# timings in the build dir, which is what the hotspot reports are built from.
+CMAKE_GENERATOR = 'Ninja Multi-Config'
+
+SLN_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent
+CMAKE_PRESETS_FILENAME = 'CMakePresets.json'
+UNITY_BUILD_DIRNAME = 'unity'
+
+
+# How much of a failed build's log is printed to the console.
+BUILD_LOG_TAIL_LINES = 40
+
+STATUS_TEXT_PREFIX = "Working..."
+STATUS_TEXT_ERROR_PREFIX = "Error:"
+
+
+class DirectoryAlreadyExistsError(Exception):
+    def __init__(self, directory, message="Directory already exists. directory="):
+        self.directory = directory
+        self.message = f"{message}: {directory}"
+        super().__init__(self.message)
+
+
+class PackageCacheNotSetError(Exception):
+    def __init__(self):
+        message = ("The 'PACKAGE_CACHE_PATH' environment variable is not set."
+                   " Please set this variable to the path of your package cache.")
+        super().__init__(message)
+
+
+@functools.lru_cache(maxsize=None)
+def get_toolchain_id():
+    """
+    Identifies the compiler the dev environment sets up, e.g. "msvc-14.38.33130-x64".
+    Builds are only interchangeable between machines using the same toolset, regardless
+    of where or in which Visual Studio edition it's installed.
+
+    Returns:
+        The toolchain id, or None if the dev environment couldn't be queried, in which
+        case build outputs shouldn't be shared.
+    """
+    try:
+        with tempfile.NamedTemporaryFile('w', delete=False, suffix='.bat') as batch_file:
+            batch_file.write('@echo off\n')
+            batch_file.write(f'call {VS_DEV_COMMAND} >nul || exit /b 1\n')
+            batch_file.write('echo VCToolsVersion=%VCToolsVersion%\n')
+            batch_file.write('echo VSCMD_ARG_TGT_ARCH=%VSCMD_ARG_TGT_ARCH%\n')
+            batch_file_path = batch_file.name
+        try:
+            result = subprocess.run(['cmd.exe', '/c', batch_file_path], check=True,
+                                    capture_output=True, text=True, errors='replace')
+        finally:
+            os.remove(batch_file_path)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Could not query the compiler toolchain: {e}")
+        return None
+
+    variables = {}
+    for line in result.stdout.splitlines():
+        name, _, value = line.strip().partition('=')
+        # cmd echoes unset variables back as %NAME%.
+        if value and not value.startswith('%'):
+            variables[name] = value
+
+    tools_version = variables.get('VCToolsVersion')
+    if not tools_version:
+        print("Could not determine VCToolsVersion from the dev environment.")
+        return None
+    return f"msvc-{tools_version}-{variables.get('VSCMD_ARG_TGT_ARCH', 'x64')}"
+
+
+def clean_version(version):
+    """Strips a source prefix such as "git|", leaving the version's directory name."""
+    return version.split('|')[1] if '|' in version else version
+
+
+def get_selected_packages(dependencies):
+    """
+    Returns (package_name, version) pairs for the packages in a dependencies.json dict,
+    in the same form the GUI reports its checked packages.
+    """
+    return [(package_name, version) for package_name, version in dependencies.items()
+            if isinstance(version, str)]
+
+
+class PackagePipeline:
+    def __init__(self, sln_dir=SLN_DIR, status_callback=print):
+        self.sln_dir = Path(sln_dir)
+        self.dependencies_path = self.sln_dir / 'dependencies.json'
+        self.supported_packages_dir = self.sln_dir / 'premake' / 'supported-packages'
+        self.generated_dir = self.sln_dir / 'premake' / 'generated'
+        self.static_libs_dir = self.sln_dir / 'source' / '_static'
+        self.status_callback = status_callback
+        self.package_store = PackageStore(self.supported_packages_dir,
+                                          self.generated_dir / PACKAGE_INDEX_FILENAME)
+        self.dependencies = {}
+        # Number of .cpp files per generated unity file. 0 disables unity builds.
+        self.unity_batch_size = 0
+        # Optional ccache/sccache launcher for package builds, and the cache dir it shares.
+        self.compiler_launcher = ""
+        self.compiler_cache_dir = ""
+
+
+    def load_package_store(self):
+        self.package_store.load_index()
+
+
+    def load_dependencies(self):
+        try:
+            with open(self.dependencies_path, encoding='utf-8') as file:
+                self.dependencies = json.load(file)
+        except FileNotFoundError:
+            self.dependencies = {}
+
+
+    def load_settings(self, config_parser):
+        """Reads the pipeline's options from a parsed settings.ini."""
+        self.unity_batch_size = config_parser.getint('DEFAULT', 'unity_batch_size', fallback=0)
+        self.compiler_launcher = config_parser.get('DEFAULT', 'compiler_launcher', fallback="")
+        self.compiler_cache_dir = config_parser.get('DEFAULT', 'compiler_cache_dir', fallback="")
+
+
+    def set_status(self, text):
+        self.status_callback(text)
+
+
+    def has_package_scripts(self, package_name, version):
+        """
+        Whether premake can use this version of the package. Header-only packages only
+        need their include_roots, anything else needs a supported-packages/<package>/<version>
+        dir holding its premake script or config.
+        """
+        if self.package_store.has_flag(package_name, FLAG_HEADER_ONLY):
+            return True
+        version = clean_version(version)
+        return (self.supported_packages_dir / package_name / version).is_dir()
+
+
+    # If packages need building, build them.
+    def build_packages(self, checked_packages):
+        """
+        Builds the packages we ship CMake presets for, or restores them from the artifact
+        cache. Packages without presets are skipped.
+
+        Returns:
+            bool indicating whether every package that needed building was built or restored.
+        """
+        artifact_cache = ArtifactCache.from_environment()
+        succeeded = True
+        for package_name, version in checked_packages:
+            if self.package_store.has_flag(package_name, FLAG_HEADER_ONLY):
+                print(f"{package_name} is header-only, nothing to build.")
+                continue
+            version = clean_version(version)
+            cmake_presets_dir = self.supported_packages_dir / package_name / version
+            cmake_presets_file = cmake_presets_dir / CMAKE_PRESETS_FILENAME
+            if os.path.isfile(cmake_presets_file):
+                print(f"Found CMakePresets.json for {package_name} at {cmake_presets_file}")
+                package_cache_path = self.get_package_cache_path()
+                repo_path = package_cache_path / package_name / version / package_name
+                build_dir = repo_path / CMAKE_BUILD_DIRNAME
+
+                required_modules = self.get_required_modules(package_name)
+                presets = self.get_effective_presets(package_name, cmake_presets_file, required_modules)
+                artifact_key = self.get_artifact_key(package_name, repo_path, presets, required_modules)
+                if artifact_cache and artifact_key:
+                    if has_artifact_marker(build_dir, artifact_key):
+                        print(f"{package_name} build outputs are already up to date.")
+                        continue
+                    self.set_status(f"{STATUS_TEXT_PREFIX} Fetching prebuilt {package_name}...")
+                    if artifact_cache.fetch(artifact_key, build_dir):
+                        continue
+
+                clear_artifact_marker(build_dir)
+                self.set_status(f"{STATUS_TEXT_PREFIX} Building {package_name}...")
+                build_succeeded = all([self.do_execute_cmake(presets, repo_path, configuration)
+                                       for configuration in CMAKE_BUILD_COMMANDS])
+
+                if not build_succeeded:
+                    self.set_status(f"{STATUS_TEXT_ERROR_PREFIX} Failed to build {package_name}.")
+                    succeeded = False
+                    continue
+
+                if artifact_cache and artifact_key:
+                    self.set_status(f"{STATUS_TEXT_PREFIX} Publishing {package_name} build outputs...")
+                    artifact_cache.publish(artifact_key, build_dir, ARTIFACT_SUBDIRS)
+        return succeeded
+
+
+    def get_required_modules(self, package_name):
+        """
+        Returns the selected modules of a package plus their dependencies, or None if the
+        package has no module selection, in which case everything gets built.
+        """
+        modules_key = f"{package_name}_modules"
+        module_definitions = self.package_store[package_name].get("module_definitions")
+        if not module_definitions or modules_key not in self.dependencies:
+            return None
+        return resolve_required_modules(module_definitions, self.dependencies[modules_key])
+
+
+    def get_effective_presets(self, package_name, cmake_presets_file, required_modules):
+        """
+        Returns the presets we ship for a package with the bootstrapper's overrides applied.
+        This is what actually gets written into the package checkout.
+        """
+        with open(cmake_presets_file, encoding='utf-8') as file:
+            presets = json.load(file)
+
+        # Turns unselected modules off, e.g. SFML_BUILD_AUDIO=OFF when audio isn't used.
+        module_cmake_options = self.package_store[package_name].get("module_cmake_options", {})
+        for configure_preset in presets.get('configurePresets', []):
+            configure_preset['generator'] = CMAKE_GENERATOR
+            if required_modules is not None:
+                cache_variables = configure_preset.setdefault('cacheVariables', {})
+                for module_name, option in module_cmake_options.items():
+                    cache_variables[option] = "ON" if module_name in required_modules else "OFF"
+        if self.compiler_launcher:
+            inject_compiler_launcher(presets, self.compiler_launcher, self.compiler_cache_dir,
+                                     base_dir=self.get_package_cache_path())
+        return presets
+
+
+    def get_artifact_key(self, package_name, repo_path, presets, required_modules):
+        """
+        Returns the ArtifactKey that identifies this package's build outputs, or None if
+        the checkout's commit or the compiler toolchain can't be determined.
+        """
+        commit = GitHelper.get_head_commit(repo_path)
+        toolchain_id = get_toolchain_id()
+        if not commit or not toolchain_id:
+            return None
+        return ArtifactKey(package=package_name,
+                           commit=commit,
+                           presets_hash=hash_json(strip_compiler_cache_environment(presets)),
+                           toolchain=toolchain_id,
+                           modules=tuple(sorted(required_modules or ())))
+
+
+    def do_execute_cmake(self, presets, package_dir, configuration):
+        """
+        Configures and builds one configuration of a package. Output goes to a compressed
+        log in <build>/logs, and the steps ninja ran are summarized into a hotspot report in
+        <build>/reports.
+
+        Returns:
+            bool indicating whether configure and build succeeded.
+        """
+        package_name = package_dir.name
+        build_dir = package_dir / CMAKE_BUILD_DIRNAME
+        try:
+            with open(package_dir / CMAKE_PRESETS_FILENAME, 'w', encoding='utf-8') as presets_file:
+                json.dump(presets, presets_file, indent=4)
+            print(f"Wrote {CMAKE_PRESETS_FILENAME} to {package_dir}")
+            self.reset_cmake_cache_on_generator_change(build_dir)
+
+            with tempfile.NamedTemporaryFile('w', delete=False, suffix='.bat') as batch_file:
+                batch_file.write('@echo off\n')
+                batch_file.write(f'call {VS_DEV_COMMAND}\n')
+                batch_file.write(f'cd /d "{package_dir}"\n')
+                batch_file.write(f'echo configuring {package_name}\n')
+                batch_file.write(f'{CMAKE_CONFIGURE_COMMAND} || exit /b 1\n')
+                batch_file.write(f'echo building {package_name}\n')
+                batch_file.write(f'{CMAKE_BUILD_COMMANDS[configuration]}\n')
+
+                batch_file_path = batch_file.name
+
+            try:
+                log_path = build_dir / BUILD_LOGS_DIRNAME / f"{configuration}.log.gz"
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                ninja_log_offset = get_ninja_log_offset(build_dir)
+                compiler_cache_stats_before = self.read_compiler_cache_stats()
+
+                print(f"Building {package_name} {configuration}. Log: {log_path}")
+                # Kept so a failure can be shown without unpacking the log.
+                log_tail = collections.deque(maxlen=BUILD_LOG_TAIL_LINES)
+                with gzip.open(log_path, 'wt', encoding='utf-8') as log_file:
+                    process = subprocess.Popen(['cmd.exe', '/c', batch_file_path],
+                                               stdout=subprocess.PIPE,
+                                               stderr=subprocess.STDOUT,
+                                               text=True,
+                                               errors='replace')
+                    for line in process.stdout:
+                        log_file.write(line)
+                        log_tail.append(line)
+                    return_code = process.wait()
+            finally:
+                os.remove(batch_file_path)
+        except OSError as e:
+            print(f"Error running Cmake: {e}")
+            return False
+
+        if return_code != 0:
+            print(f"Error building {package_name} {configuration}. Last lines of {log_path}:")
+            print(''.join(log_tail).rstrip())
+            return False
+
+        report = build_hotspot_report(read_ninja_log(build_dir, ninja_log_offset),
+                                      package_name, configuration)
+        compiler_cache_stats_after = self.read_compiler_cache_stats()
+        if compiler_cache_stats_before and compiler_cache_stats_after:
+            build_stats = compiler_cache_stats_after - compiler_cache_stats_before
+            report["compiler_cache"] = {
+                "launcher": self.compiler_launcher,
+                "hits": build_stats.hits,
+                "misses": build_stats.misses,
+                "hit_rate": build_stats.hit_rate,
+            }
+            print(f"{self.compiler_launcher} {package_name} {configuration}: {build_stats.hits} hits,"
+                  f" {build_stats.misses} misses ({build_stats.hit_rate:.0%})")
+        write_hotspot_report(report, build_dir)
+        print_hotspot_summary(report)
+        return True
+
+
+    def read_compiler_cache_stats(self):
+        if not self.compiler_launcher:
+            return None
+        return read_compiler_cache_stats(self.compiler_launcher, self.compiler_cache_dir)
+
+
+    def reset_cmake_cache_on_generator_change(self, build_dir):
+        """
+        CMake refuses to configure a build dir that was made by a different generator, which
+        is the case for any package built before the generator override existed.
+        """
+        cmake_cache_path = build_dir / 'CMakeCache.txt'
+        if not cmake_cache_path.is_file():
+            return
+
+        with open(cmake_cache_path, encoding='utf-8', errors='replace') as cmake_cache_file:
+            for line in cmake_cache_file:
+                if line.startswith('CMAKE_GENERATOR:INTERNAL='):
+                    generator = line.split('=', 1)[1].strip()
+                    break
+            else:
+                return
+
+        if generator != CMAKE_GENERATOR:
+            print(f"Build dir {build_dir} was generated with {generator}. Resetting its CMake cache.")
+            cmake_cache_path.unlink()
+            shutil.rmtree(build_dir / 'CMakeFiles', ignore_errors=True)
+
+
+    def get_package_cache_path(self):
+        package_cache_path_str = os.getenv('PACKAGE_CACHE_PATH')
+        if not package_cache_path_str:
+            self.set_status(f"{STATUS_TEXT_ERROR_PREFIX} PACKAGE_CACHE_PATH env variable not set.")
+            raise PackageCacheNotSetError()
+        return Path(package_cache_path_str)
+
+    def fetch_packages(self, checked_packages):
+        """
+        Clones or updates each package in the package cache. A package that can't be cloned
+        is reported and skipped, the rest are still fetched.
+
+        Returns:
+            bool indicating whether every package was fetched.
+        """
+        package_cache_path = self.get_package_cache_path()
+        succeeded = True
+
+        for package_name, version in checked_packages:
+            version = clean_version(version)
+            repo_path = package_cache_path / package_name / version / package_name
+            repo_url = self.package_store[package_name]['git_url']
+            mirrors = self.package_store[package_name].get('mirrors', [])
+            print(f"attempting repo={package_name} version={version}")
+
+            if GitHelper.does_repo_exist(repo_path):
+                self.set_status(f"{STATUS_TEXT_PREFIX} Updating {package_name}...")
+                print(f"Repo exists at {repo_path}. Ensuring up to date.")
+                if GitHelper.is_correct_version(repo_path, version):
+                    GitHelper.reset_hard(repo_path)
+                    GitHelper.pull(repo_path)
+                else:
+                    GitHelper.checkout(repo_path, version)
+            else:
+                self.set_status(f"{STATUS_TEXT_PREFIX} Cloning {package_name}...")
+                if mirrors:
+                    mirror_stats = MirrorStats(package_cache_path / MIRROR_STATS_FILENAME)
+                    cloned = MirrorSelector(mirror_stats).clone(repo_path, [repo_url] + mirrors) is not None
+                else:
+                    cloned = GitHelper.clone(repo_path, repo_url) is not None
+                if not cloned:
+                    self.set_status(f"{STATUS_TEXT_ERROR_PREFIX} Failed to clone {package_name}.")
+                    succeeded = False
+                    continue
+                self.set_status(f"{STATUS_TEXT_PREFIX} Checking out branch {version}...")
+                GitHelper.checkout(repo_path, version)
+
+        return succeeded
+
+
+    def json_to_lua(self, data, indent_level=0):
+        """
+        Recursively converts a Python dictionary or list (parsed from JSON)
+        into Lua table syntax as a string, with improved readability (indents and line breaks).
+        """
+        indent = " " * (indent_level * 4)  # 4 spaces per indent level
+        next_indent = " " * ((indent_level + 1) * 4)
+
+        if isinstance(data, dict):
+            # It's a dictionary, convert it to a Lua table with key-value pairs
+            lua_table = "{\n"
+            for key, value in data.items():
+                # Keys that aren't valid Lua identifiers (e.g. "my-lib") need the bracket form.
+                lua_key = key if re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', key) else f'["{key}"]'
+                lua_table += f"{next_indent}{lua_key} = {self.json_to_lua(value, indent_level + 1)},\n"
+            lua_table += indent + "}"
+            return lua_table
+        elif isinstance(data, list):
+            # It's a list, convert it to a Lua table with values
+            lua_array = "{\n"
+            for item in data:
+                lua_array += f"{next_indent}{self.json_to_lua(item, indent_level + 1)},\n"
+            lua_array += indent + "}"
+            return lua_array
+        elif isinstance(data, bool):
+            return "true" if data else "false"
+        else:
+            # It's a basic data type (string, number, etc.), return as a Lua-compatible value
+            if isinstance(data, str):
+                return f'"{data}"'
+            return str(data)
+
+
+    def generate_package_info_lua(self, checked_packages):
+        # Define the path for package_info.lua
+        package_info_lua_path = self.generated_dir / 'package_info.lua'
+        package_info_lua_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Building the dictionary for package info
+        packages_dict = {}
+        for package_name, version in checked_packages:
+            version = clean_version(version)
+            package_data = self.package_store.get(package_name)
+
+            if package_data and package_data.get("header_only"):
+                # Consumers only need the include paths, so premake makes no project for these.
+                # include_roots are relative to the checkout, which premake resolves in the cache.
+                packages_dict[package_name] = {
+                    "version": version,
+                    "include_in_build": False,
+                    "header_only": True,
+                    "include_roots": package_data.get("include_roots", []),
+                }
+            elif package_data:
+                include_in_build = True
+                package_dict = {"version": version}
+                if f"{package_name}_modules" in self.dependencies:
+                    package_dict["modules"] = self.dependencies[f"{package_name}_modules"]
+                    include_in_build = False
+                package_dict["include_in_build"] = include_in_build
+                package_cache_path = self.get_package_cache_path()
+                repo_path = package_cache_path / package_name / version / package_name
+                if include_in_build and "manifest" in package_data:
+                    # Saves premake from globbing the checkout on every run.
+                    package_dict["manifest"] = get_file_manifest(repo_path, package_data["manifest"])
+                if include_in_build and self.unity_batch_size > 0 and "unity_build" in package_data:
+                    unity = self.generate_unity_build(package_name, repo_path, package_data["unity_build"])
+                    if unity:
+                        package_dict["unity"] = unity
+                packages_dict[package_name] = package_dict
+
+        package_info = {"packages": packages_dict}
+        if self.unity_batch_size > 0:
+            package_info["static_unity"] = self.generate_static_unity_builds()
+
+        # Convert the dictionary to a JSON string
+        package_info_json = json.dumps(package_info, indent=4)
+
+        # Parse the JSON string into a Python object (dict or list)
+        parsed_json = json.loads(package_info_json)
+
+        # Convert the parsed JSON into Lua syntax
+        lua_content = f"return {self.json_to_lua(parsed_json)}\n"
+
+        # Write the content to package_info.lua
+        with open(package_info_lua_path, 'w', encoding='utf-8') as file:
+            file.write(lua_content)
+
+    def generate_unity_build(self, project_name, base_dir, unity_build_info):
+        """
+        Generates unity files for a project and returns the table package_info.lua expects,
+        or None if there was nothing to batch.
+
+        unity_build_info comes from the package's package.json, e.g.
+        {"sources": ["src"], "exclude": ["src/fmt.cpp"]}, with paths relative to base_dir.
+        """
+        source_dirs = [base_dir / source_dir for source_dir in unity_build_info.get("sources", [])]
+        exclude = [base_dir / excluded for excluded in unity_build_info.get("exclude", [])]
+        sources = find_sources(source_dirs, exclude)
+
+        generator = UnityBuildGenerator(self.generated_dir / UNITY_BUILD_DIRNAME, self.unity_batch_size)
+        units = generator.generate(project_name, sources)
+        if not units:
+            return None
+
+        return {
+            "units": [unit.as_posix() for unit in units],
+            "sources": [source.as_posix() for source in sources],
+        }
+
+
+    def generate_static_unity_builds(self):
+        """Generates unity files for each project under source/_static."""
+        static_unity = {}
+        if not self.static_libs_dir.is_dir():
+            return static_unity
+
+        for lib_dir in sorted(self.static_libs_dir.iterdir()):
+            if lib_dir.is_dir():
+                unity = self.generate_unity_build(f"_static_{lib_dir.name}", lib_dir, {"sources": ["."]})
+                if unity:
+                    static_unity[lib_dir.name] = unity
+        return static_unity
+
+
+    def execute_premake(self, solution_dir, solution_name):
+        """
+        Runs premake for the solution. Returns whether it succeeded.
+
+        premake runs with the solution as its working directory rather than changing the
+        process's, so several solutions can be generated at once.
+        """
+        succeeded = False
+        solution_dir = Path(solution_dir)
+        print(f"Project generated at {solution_dir}")
+        print(f"Locating Premake")
+        premake_executable = solution_dir / 'premake' / 'premake5.exe'
+        if premake_executable.exists():
+            try:
+                command = [
+                    str(premake_executable),
+                    f'--sln_dir={str(solution_dir)}',
+                    f'--sln_name={solution_name}',
+                    "vs2022"
+                ]
+
+                print("Running Premake with command:", " ".join(command))
+                result = subprocess.run(command, check=True, capture_output=True, text=True,
+                                        cwd=solution_dir)
+
+                print(f"Premake output: {result.stdout}")
+                succeeded = True
+            except subprocess.CalledProcessError as e:
+                print(f"Error running premake: {e.output}")
+                self.set_status(f"{STATUS_TEXT_ERROR_PREFIX} Error running premake.")
+        else:
+            print(f"Premake executable not found at {premake_executable}.")
+            self.set_status(f"{STATUS_TEXT_ERROR_PREFIX} Premake executable not found.")
+        return succeeded
+
+
+    def create_solution_dir(self, solution_dir, solution_name, dependencies=None):
+        """
+        Lays out a new solution from this pipeline's sln_dir: the premake scripts, the
+        bootstrapper, settings.ini and a default project named after the solution.
+
+        Args:
+            solution_dir (Path): Where to create the solution. Must be empty or missing.
+            solution_name (str): The solution's name.
+            dependencies (dict): Written as the solution's dependencies.json. Defaults to
+                a copy of sln_dir's.
+        """
+        # I'm gonna error here because I want the user to decide what to do.
+        # I don't want to just overwrite or delete their stuff.
+        if solution_dir.exists() and os.listdir(solution_dir):
+            raise DirectoryAlreadyExistsError(solution_dir)
+
+        solution_dir.mkdir(parents=True, exist_ok=True)
+        print(f"Creating directory at {solution_dir}")
+
+        # These files are needed go properly generate and update project files.
+        shutil.copytree(self.sln_dir / 'premake', solution_dir / 'premake', dirs_exist_ok=True)
+        if dependencies is None:
+            shutil.copy2(self.dependencies_path, solution_dir)
+        else:
+            with open(solution_dir / 'dependencies.json', 'w', encoding='utf-8') as file:
+                json.dump(dependencies, file, indent=4)
+        shutil.copy2(self.sln_dir / 'premake5.lua', solution_dir)
+        # The tests are for developing the bootstrapper, generated solutions only run it.
+        shutil.copytree(self.sln_dir / 'scripts', solution_dir / 'scripts', dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns('tests', '__pycache__'))
+
+        # Might as well copy this over too, as it includes a lot of script/premake related paths.
+        copy_modified_gitignore(self.sln_dir, solution_dir)
+
+        # Create settings.ini and Source directory
+        with open(solution_dir / 'settings.ini', 'w', encoding='utf-8') as file:
+            file.write("[DEFAULT]\n")
+            file.write("mode = UPDATE\n")
+            file.write(f"solution_name = {solution_name}\n")
+            if self.unity_batch_size > 0:
+                file.write(f"unity_batch_size = {self.unity_batch_size}\n")
+            if self.compiler_launcher:
+                file.write(f"compiler_launcher = {self.compiler_launcher}\n")
+            if self.compiler_cache_dir:
+                file.write(f"compiler_cache_dir = {self.compiler_cache_dir}\n")
+        (solution_dir / 'source').mkdir()
+
+        # Create a default project with the same name as the sln name.
+        default_project_dir = solution_dir / 'source' / solution_name
+        default_project_dir.mkdir()
+
+        main_cpp_file_path = default_project_dir / 'main.cpp'
+        with open(main_cpp_file_path, 'w', encoding='utf-8') as main_cpp_file:
+            main_cpp_file.write('#include <iostream>\n\n')
+            main_cpp_file.write('int main()\n{\n')
+            main_cpp_file.write('    return 0;\n')
+            main_cpp_file.write('}\n')
+
+
+def copy_modified_gitignore(source, destination):
+    print("Copy modified gitignore")
+    gitignore_path = source / '.gitignore'
+    destination_path = destination / '.gitignore'
+
+    # Read the original .gitignore file
+    with gitignore_path.open('r') as file:
+        lines = file.readlines()
+
+    # We actually want generated projects to commit these files. This is how the Update
+    # system knows how to update itself.
+    lines_to_remove = [
+        "# Removed in UPDATE mode.\n",
+        "/dependencies.json\n",
+        "premake/generated/package_info.lua\n",
+        "/settings.ini\n",
+    ]
+
+    modified_lines = [line for line in lines if line not in lines_to_remove]
+
+    # Write the modified lines to the destination .gitignore
+    with destination_path.open('w') as file:
+        file.writelines(modified_lines)
+
+    print(f"Modified .gitignore copied to {destination_path}")
+
+
+def write_package_manager_batch_script(solution_dir):
+    try:
+        batch_file_path = solution_dir / 'run_bootstrapper.bat'
+        # Relative to the solution, which is where the batch file gets run from.
+        python_script_path = Path('scripts') / 'bootstrapper.py'
+        with open(batch_file_path, 'w') as batch_file:
+            batch_file.write(f'@echo off\n')
+            batch_file.write(f'python "{python_script_path}"\n')
+
+            # TODO: Keeping the command window open for logs. Maybe make this configurable.
+            batch_file.write(f'pause\n')
+
+        print(f"Batch file written at {batch_file_path}")
+
+    except Exception as e:
+        print(f"Error: {e}")
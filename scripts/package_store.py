@@ -0,0 +1,177 @@
+"""
+This module reads the package catalog. Each package has its own manifest at
+premake/supported-packages/<package>/package.json, so adding or editing a package only
+touches that package's file:
+
+    {
+        "git_url": "https://github.com/gabime/spdlog.git",
+        "order": 1,
+        "versions": ["v1.12.0"],
+        "manifest": {...}
+    }
+
+"order" sets where the package is listed in the GUI. Packages without one come last, by name.
+
+Startup only needs each package's name, versions, url and a few flags, so those are kept
+in a compact index (premake/generated/package_index.json). The index remembers each
+manifest's mtime and only manifests that changed get parsed again. Full manifests are
+loaded the first time a package is looked up.
+"""
+
+
+import json
+import os
+import threading
+from pathlib import Path
+
+PACKAGE_MANIFEST_FILENAME = 'package.json'
+PACKAGE_INDEX_FILENAME = 'package_index.json'
+
+# Flags kept in the index so the GUI can lay itself out without loading manifests.
+FLAG_HEADER_ONLY = 'header_only'
+FLAG_MODULES = 'modules'
+FLAG_MIRRORS = 'mirrors'
+
+
+class PackageManifestError(Exception):
+    def __init__(self, manifest_path, reason):
+        self.manifest_path = manifest_path
+        self.message = f"Invalid package manifest {manifest_path}: {reason}"
+        super().__init__(self.message)
+
+
+def read_package_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding='utf-8') as file:
+            manifest = json.load(file)
+    except json.JSONDecodeError as e:
+        raise PackageManifestError(manifest_path, e)
+
+    for required_key in ('git_url', 'versions'):
+        if required_key not in manifest:
+            raise PackageManifestError(manifest_path, f"missing '{required_key}'.")
+    return manifest
+
+
+def build_index_entry(manifest, mtime_ns):
+    flags = []
+    if manifest.get("header_only"):
+        flags.append(FLAG_HEADER_ONLY)
+    if "module_definitions" in manifest:
+        flags.append(FLAG_MODULES)
+    if manifest.get("mirrors"):
+        flags.append(FLAG_MIRRORS)
+
+    return {
+        "mtime_ns": mtime_ns,
+        "git_url": manifest["git_url"],
+        "order": manifest.get("order"),
+        "versions": manifest["versions"],
+        "flags": flags,
+    }
+
+
+def get_listing_order(item):
+    package_name, entry = item
+    order = entry.get("order")
+    return (order is None, order if order is not None else 0, package_name)
+
+
+class PackageStore:
+    """
+    Read-only, dict-like view of the package catalog. Iterating and membership tests only
+    use the index. Indexing with a package name returns its full manifest.
+    """
+    def __init__(self, supported_packages_dir, index_path):
+        self.supported_packages_dir = Path(supported_packages_dir)
+        self.index_path = Path(index_path)
+        self.index: dict[str, dict] = {}
+        self._manifests: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load_index(self):
+        """
+        Brings the index up to date with the manifests on disk, re-reading only the ones
+        whose mtime changed, and saves it if anything did.
+        """
+        try:
+            with open(self.index_path, encoding='utf-8') as file:
+                cached_index = json.load(file)
+        except FileNotFoundError:
+            cached_index = {}
+        except json.JSONDecodeError as e:
+            print(f"Ignoring unreadable package index {self.index_path}: {e}")
+            cached_index = {}
+
+        index = {}
+        manifests = {}
+        if self.supported_packages_dir.is_dir():
+            for package_dir in sorted(self.supported_packages_dir.iterdir()):
+                manifest_path = package_dir / PACKAGE_MANIFEST_FILENAME
+                if not manifest_path.is_file():
+                    continue
+
+                package_name = package_dir.name
+                mtime_ns = manifest_path.stat().st_mtime_ns
+                cached_entry = cached_index.get(package_name)
+                if cached_entry and cached_entry.get("mtime_ns") == mtime_ns:
+                    index[package_name] = cached_entry
+                    continue
+
+                print(f"Indexing package manifest {manifest_path}")
+                manifest = read_package_manifest(manifest_path)
+                index[package_name] = build_index_entry(manifest, mtime_ns)
+                # Already parsed it, no reason to read it again on first lookup.
+                manifests[package_name] = manifest
+
+        index = dict(sorted(index.items(), key=get_listing_order))
+        with self._lock:
+            self.index = index
+            self._manifests = manifests
+
+        # Compared as lists so a change in order alone is saved too.
+        if list(index.items()) != list(cached_index.items()):
+            self._save(index)
+
+    def _save(self, index):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Several pipelines can load the same store at once, e.g. when generating a matrix.
+        temp_path = self.index_path.with_name(
+            f"{self.index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(index, file, indent=4)
+        os.replace(temp_path, self.index_path)
+
+    def __contains__(self, package_name):
+        return package_name in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, package_name):
+        if package_name not in self.index:
+            raise KeyError(package_name)
+
+        with self._lock:
+            manifest = self._manifests.get(package_name)
+        if manifest is None:
+            manifest = read_package_manifest(
+                self.supported_packages_dir / package_name / PACKAGE_MANIFEST_FILENAME)
+            with self._lock:
+                self._manifests[package_name] = manifest
+        return manifest
+
+    def get(self, package_name, default=None):
+        return self[package_name] if package_name in self.index else default
+
+    def get_versions(self, package_name):
+        return self.index[package_name]["versions"]
+
+    def get_git_url(self, package_name):
+        return self.index[package_name]["git_url"]
+
+    def has_flag(self, package_name, flag):
+        return flag in self.index[package_name]["flags"]
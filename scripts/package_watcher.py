@@ -0,0 +1,260 @@
+"""
+This module implements watch mode. It polls the inputs a solution is generated from and,
+once they have been quiet for a moment, reruns only the pipeline stages affected by what
+changed:
+
+    version change in dependencies.json      fetch + build that package, package_info, premake
+    module change in dependencies.json       build that package, package_info, premake
+    package.json edit of a selected package  build that package, package_info, premake
+    project added/removed under source/      premake (and package_info for _static projects)
+    supported-packages premake script edit   premake
+    supported-packages CMakePresets.json     build that package
+
+Start it from a generated solution with:
+
+    python scripts/bootstrapper.py watch
+"""
+
+
+import json
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from package_pipeline import (CMAKE_PRESETS_FILENAME, STATUS_TEXT_ERROR_PREFIX, PackagePipeline,
+                              clean_version, get_selected_packages)
+from package_store import PACKAGE_MANIFEST_FILENAME
+
+DEFAULT_POLL_INTERVAL_SECONDS = 0.5
+
+# Editors often save in several steps, and people tend to make a few edits in a row.
+DEFAULT_DEBOUNCE_SECONDS = 1.5
+
+
+class ChangeKind(Enum):
+    VERSION = 1
+    MODULES = 2
+    PACKAGE_MANIFEST = 3
+    SOURCE_PROJECT = 4
+    STATIC_PROJECT = 5
+    PACKAGE_SCRIPT = 6
+    PACKAGE_PRESETS = 7
+
+
+@dataclass(frozen=True)
+class InputChange:
+    kind: ChangeKind
+    package_name: str = ""
+
+
+@dataclass
+class InputSnapshot:
+    dependencies: dict
+    source_projects: frozenset
+    static_projects: frozenset
+    # Path relative to supported-packages, e.g. "sfml/2.6.1/config.lua", to its mtime.
+    package_files: dict
+
+
+@dataclass
+class StagePlan:
+    fetch: set = field(default_factory=set)
+    build: set = field(default_factory=set)
+    package_info: bool = False
+    premake: bool = False
+
+    def is_empty(self):
+        return not (self.fetch or self.build or self.package_info or self.premake)
+
+
+def take_snapshot(pipeline: PackagePipeline):
+    """
+    Captures the state of every watched input. Returns None if dependencies.json can't be
+    parsed, which usually means it is halfway through being written.
+    """
+    try:
+        with open(pipeline.dependencies_path, encoding='utf-8') as file:
+            dependencies = json.load(file)
+    except FileNotFoundError:
+        dependencies = {}
+    except json.JSONDecodeError:
+        return None
+
+    def project_dirs(directory):
+        if not directory.is_dir():
+            return frozenset()
+        return frozenset(child.name for child in directory.iterdir()
+                         if child.is_dir() and child.name != pipeline.static_libs_dir.name)
+
+    package_files = {}
+    if pipeline.supported_packages_dir.is_dir():
+        for file_path in pipeline.supported_packages_dir.rglob('*'):
+            if file_path.is_file():
+                relative_path = file_path.relative_to(pipeline.supported_packages_dir).as_posix()
+                package_files[relative_path] = file_path.stat().st_mtime_ns
+
+    return InputSnapshot(
+        dependencies=dependencies,
+        source_projects=project_dirs(pipeline.static_libs_dir.parent),
+        static_projects=project_dirs(pipeline.static_libs_dir),
+        package_files=package_files,
+    )
+
+
+def classify_changes(old: InputSnapshot, new: InputSnapshot):
+    """
+    Returns list[InputChange] describing what differs between two snapshots. Manifest
+    and script edits only count for packages (and versions) the new dependencies select.
+    """
+    changes = []
+
+    old_versions = dict(get_selected_packages(old.dependencies))
+    new_versions = dict(get_selected_packages(new.dependencies))
+    for package_name in old_versions.keys() | new_versions.keys():
+        if old_versions.get(package_name) != new_versions.get(package_name):
+            changes.append(InputChange(ChangeKind.VERSION, package_name))
+        elif old.dependencies.get(f"{package_name}_modules") != new.dependencies.get(f"{package_name}_modules"):
+            changes.append(InputChange(ChangeKind.MODULES, package_name))
+
+    if old.source_projects != new.source_projects:
+        changes.append(InputChange(ChangeKind.SOURCE_PROJECT))
+    if old.static_projects != new.static_projects:
+        changes.append(InputChange(ChangeKind.STATIC_PROJECT))
+
+    selected_dirs = {(package_name, clean_version(version)) for package_name, version in new_versions.items()}
+    changed_files = {path for path in old.package_files.keys() | new.package_files.keys()
+                     if old.package_files.get(path) != new.package_files.get(path)}
+    for path in sorted(changed_files):
+        parts = path.split('/')
+        if parts[-1] == PACKAGE_MANIFEST_FILENAME and len(parts) == 2:
+            if parts[0] in new_versions:
+                changes.append(InputChange(ChangeKind.PACKAGE_MANIFEST, parts[0]))
+            continue
+        if len(parts) < 3 or (parts[0], parts[1]) not in selected_dirs:
+            continue
+        kind = ChangeKind.PACKAGE_PRESETS if parts[-1] == CMAKE_PRESETS_FILENAME else ChangeKind.PACKAGE_SCRIPT
+        changes.append(InputChange(kind, parts[0]))
+
+    # Several edits to the same package's scripts only need to be handled once.
+    return list(dict.fromkeys(changes))
+
+
+def plan_stages(changes):
+    """Maps changes to the smallest set of pipeline stages that brings the solution up to date."""
+    plan = StagePlan()
+    for change in changes:
+        if change.kind == ChangeKind.VERSION:
+            plan.fetch.add(change.package_name)
+            plan.build.add(change.package_name)
+            plan.package_info = True
+            plan.premake = True
+        elif change.kind == ChangeKind.MODULES:
+            plan.build.add(change.package_name)
+            plan.package_info = True
+            plan.premake = True
+        elif change.kind == ChangeKind.PACKAGE_MANIFEST:
+            # Manifests hold build inputs too, e.g. module_cmake_options.
+            plan.build.add(change.package_name)
+            plan.package_info = True
+            plan.premake = True
+        elif change.kind == ChangeKind.STATIC_PROJECT:
+            plan.package_info = True
+            plan.premake = True
+        elif change.kind in (ChangeKind.SOURCE_PROJECT, ChangeKind.PACKAGE_SCRIPT):
+            plan.premake = True
+        elif change.kind == ChangeKind.PACKAGE_PRESETS:
+            plan.build.add(change.package_name)
+    return plan
+
+
+class PackageWatcher:
+    def __init__(self, pipeline: PackagePipeline, solution_name,
+                 poll_interval=DEFAULT_POLL_INTERVAL_SECONDS,
+                 debounce_seconds=DEFAULT_DEBOUNCE_SECONDS):
+        self.pipeline = pipeline
+        self.solution_name = solution_name
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.applied_snapshot = take_snapshot(pipeline)
+        self.last_seen_snapshot = self.applied_snapshot
+        # Inputs whose update failed. They aren't retried until something changes again.
+        self.failed_snapshot = None
+        self.last_change_time = 0.0
+
+    def run(self):
+        print(f"Watching {self.pipeline.sln_dir} for changes. Press Ctrl+C to stop.")
+        try:
+            while True:
+                self.poll(time.monotonic())
+                time.sleep(self.poll_interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+
+    def poll(self, now):
+        """
+        Takes a snapshot and, once the inputs have stopped changing for debounce_seconds,
+        applies everything that changed since the last update. If applying fails, the last
+        update stays the baseline so the same changes are retried after the next edit.
+
+        Returns:
+            The StagePlan that was run, or None if nothing ran.
+        """
+        snapshot = take_snapshot(self.pipeline)
+        if snapshot is None:
+            return None
+
+        if self.applied_snapshot is None:
+            self.applied_snapshot = self.last_seen_snapshot = snapshot
+            return None
+
+        if snapshot != self.last_seen_snapshot:
+            self.last_seen_snapshot = snapshot
+            self.last_change_time = now
+            return None
+
+        if snapshot in (self.applied_snapshot, self.failed_snapshot):
+            return None
+        if now - self.last_change_time < self.debounce_seconds:
+            return None
+
+        changes = classify_changes(self.applied_snapshot, snapshot)
+        plan = plan_stages(changes)
+        if not plan.is_empty():
+            try:
+                succeeded = self.apply(changes, plan, snapshot)
+            except Exception as e:
+                print(f"{STATUS_TEXT_ERROR_PREFIX} Update failed: {e}")
+                succeeded = False
+            if not succeeded:
+                print("Waiting for the next change to retry.")
+                self.failed_snapshot = snapshot
+                return plan
+
+        self.applied_snapshot = snapshot
+        self.failed_snapshot = None
+        return plan
+
+    def apply(self, changes, plan: StagePlan, snapshot: InputSnapshot):
+        """Runs the planned stages. Returns whether every stage succeeded."""
+        for change in changes:
+            print(f"Detected {change.kind.name.lower()} change {change.package_name}".rstrip())
+
+        self.pipeline.dependencies = snapshot.dependencies
+        self.pipeline.load_package_store()
+        selected_packages = get_selected_packages(snapshot.dependencies)
+
+        fetch_packages = [package for package in selected_packages if package[0] in plan.fetch]
+        # The pipeline has already reported which package failed.
+        if fetch_packages and not self.pipeline.fetch_packages(fetch_packages):
+            return False
+
+        build_packages = [package for package in selected_packages if package[0] in plan.build]
+        if build_packages and not self.pipeline.build_packages(build_packages):
+            return False
+
+        if plan.package_info:
+            self.pipeline.generate_package_info_lua(selected_packages)
+
+        if plan.premake and not self.pipeline.execute_premake(self.pipeline.sln_dir, self.solution_name):
+            return False
+        print("Up to date.")
+        return True
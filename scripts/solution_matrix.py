@@ -0,0 +1,231 @@
+"""
+This module generates a batch of solutions from a matrix file. Every package version any
+of the solutions uses is fetched and built once up front, with the union of the modules
+the solutions select. Then the solutions are generated in parallel, each by its own
+pipeline rooted at its own solution dir.
+
+A matrix file maps solution names to the dependencies.json each solution gets:
+
+    {
+        "output_dir": "D:/prototypes",
+        "solutions": {
+            "sfml-2.5": {"sfml": "2.5.1", "sfml_modules": ["graphics"]},
+            "sfml-2.6-logging": {"sfml": "2.6.1", "spdlog": "v1.14.1"}
+        }
+    }
+
+output_dir is optional and defaults to the directory holding the matrix file. A relative
+output_dir is resolved against that directory too.
+
+    python scripts/solution_matrix.py prototypes.json --jobs 4
+"""
+
+
+import argparse
+import configparser
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from package_pipeline import (DirectoryAlreadyExistsError, PackagePipeline, SLN_DIR,
+                              get_selected_packages, write_package_manager_batch_script)
+
+DEFAULT_MAX_PARALLEL_SOLUTIONS = 4
+
+
+class MatrixFileError(Exception):
+    def __init__(self, matrix_path, reason):
+        self.message = f"Invalid matrix file {matrix_path}: {reason}"
+        super().__init__(self.message)
+
+
+@dataclass
+class SolutionResult:
+    solution_name: str
+    solution_dir: Path
+    succeeded: bool
+    error: str = ""
+
+
+def load_matrix(matrix_path):
+    """
+    Returns:
+        (output_dir, solutions) where solutions maps each solution name to its dependencies dict.
+    """
+    matrix_path = Path(matrix_path)
+    try:
+        with open(matrix_path, encoding='utf-8') as file:
+            matrix = json.load(file)
+    except FileNotFoundError:
+        raise MatrixFileError(matrix_path, "file not found.")
+    except json.JSONDecodeError as e:
+        raise MatrixFileError(matrix_path, e)
+
+    solutions = matrix.get("solutions")
+    if not isinstance(solutions, dict) or not solutions:
+        raise MatrixFileError(matrix_path, "expected a non-empty \"solutions\" object.")
+    for solution_name, dependencies in solutions.items():
+        if not isinstance(dependencies, dict):
+            raise MatrixFileError(matrix_path, f"dependencies of '{solution_name}' must be an object.")
+
+    # A relative output_dir is relative to the matrix file, not wherever this was run from.
+    output_dir = matrix_path.resolve().parent / matrix.get("output_dir", ".")
+    return output_dir, solutions
+
+
+def get_shared_builds(solutions):
+    """
+    Collapses every solution's selection into the distinct package versions to fetch and build.
+
+    Returns:
+        dict[(package_name, version), list[str] | None] of each package version to the union
+        of the modules selected for it. None means at least one solution uses it without a
+        module selection, so all of it has to be built.
+    """
+    shared_builds = {}
+    for dependencies in solutions.values():
+        for package_name, version in get_selected_packages(dependencies):
+            modules = dependencies.get(f"{package_name}_modules")
+            key = (package_name, version)
+            if key not in shared_builds:
+                shared_builds[key] = list(modules) if modules is not None else None
+            elif shared_builds[key] is not None:
+                if modules is None:
+                    shared_builds[key] = None
+                else:
+                    shared_builds[key] += [module for module in modules if module not in shared_builds[key]]
+    return shared_builds
+
+
+class SolutionMatrix:
+    def __init__(self, template_dir=SLN_DIR, max_parallel_solutions=DEFAULT_MAX_PARALLEL_SOLUTIONS):
+        self.template_dir = Path(template_dir)
+        self.max_parallel_solutions = max_parallel_solutions
+        self.config_parser = configparser.ConfigParser()
+        self.config_parser.read(self.template_dir / 'settings.ini')
+
+
+    def create_pipeline(self, sln_dir, solution_name=None):
+        # Solutions are generated concurrently, so tag their status lines.
+        if solution_name:
+            status_callback = lambda text: print(f"[{solution_name}] {text}")
+        else:
+            status_callback = print
+        pipeline = PackagePipeline(sln_dir, status_callback=status_callback)
+        pipeline.load_settings(self.config_parser)
+        pipeline.load_package_store()
+        return pipeline
+
+
+    def run(self, matrix_path):
+        """
+        Fetches and builds the packages every solution in the matrix needs, then generates
+        the solutions.
+
+        Returns:
+            list[SolutionResult] in matrix order.
+        """
+        output_dir, solutions = load_matrix(matrix_path)
+        shared_builds = get_shared_builds(solutions)
+
+        pipeline = self.create_pipeline(self.template_dir)
+        unknown_packages = sorted({package_name for package_name, _ in shared_builds
+                                   if package_name not in pipeline.package_store})
+        if unknown_packages:
+            raise MatrixFileError(matrix_path, f"unknown packages {', '.join(unknown_packages)}.")
+
+        failed_packages = self.prepare_packages(pipeline, shared_builds)
+
+        print(f"Generating {len(solutions)} solutions in {output_dir}")
+        with ThreadPoolExecutor(max_workers=self.max_parallel_solutions) as executor:
+            futures = {}
+            unfetched_packages = {}
+            for solution_name, dependencies in solutions.items():
+                missing_packages = [f"{package_name} {version}"
+                                    for package_name, version in get_selected_packages(dependencies)
+                                    if (package_name, version) in failed_packages]
+                if missing_packages:
+                    unfetched_packages[solution_name] = missing_packages
+                    futures[solution_name] = None
+                    continue
+                futures[solution_name] = executor.submit(self.generate_solution, output_dir / solution_name,
+                                                         solution_name, dependencies)
+
+            results = []
+            for solution_name, future in futures.items():
+                if future is None:
+                    results.append(SolutionResult(
+                        solution_name, output_dir / solution_name, False,
+                        f"could not fetch {', '.join(unfetched_packages[solution_name])}."))
+                    continue
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(SolutionResult(solution_name, output_dir / solution_name, False, str(e)))
+        return results
+
+
+    def prepare_packages(self, pipeline: PackagePipeline, shared_builds):
+        """
+        Fetches and builds each distinct package version once, sequentially.
+
+        Returns:
+            set of the (package_name, version) pairs that couldn't be fetched.
+        """
+        failed_packages = set()
+        for (package_name, version), modules in shared_builds.items():
+            # The pipeline takes module selections from its dependencies, so give it one
+            # holding just this package version and every module any solution wants.
+            pipeline.dependencies = {package_name: version}
+            if modules is not None:
+                pipeline.dependencies[f"{package_name}_modules"] = modules
+            if not pipeline.fetch_packages([(package_name, version)]):
+                failed_packages.add((package_name, version))
+                continue
+            pipeline.build_packages([(package_name, version)])
+        return failed_packages
+
+
+    def generate_solution(self, solution_dir, solution_name, dependencies):
+        """
+        Lays out one solution and runs the solution-local stages (package_info.lua and
+        premake) with a pipeline rooted at the solution, so nothing is shared between
+        solutions generated at the same time.
+        """
+        try:
+            self.create_pipeline(self.template_dir, solution_name).create_solution_dir(
+                solution_dir, solution_name, dependencies)
+        except DirectoryAlreadyExistsError as e:
+            return SolutionResult(solution_name, solution_dir, False, e.message)
+
+        pipeline = self.create_pipeline(solution_dir, solution_name)
+        pipeline.load_dependencies()
+        pipeline.generate_package_info_lua(get_selected_packages(pipeline.dependencies))
+        succeeded = pipeline.execute_premake(solution_dir, solution_name)
+        write_package_manager_batch_script(solution_dir)
+        return SolutionResult(solution_name, solution_dir, succeeded,
+                              "" if succeeded else "premake failed.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a batch of solutions from a matrix file.")
+    parser.add_argument('matrix', help="Matrix file mapping solution names to their dependencies.")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_MAX_PARALLEL_SOLUTIONS,
+                        help="How many solutions to generate at once.")
+    args = parser.parse_args()
+
+    try:
+        results = SolutionMatrix(max_parallel_solutions=max(args.jobs, 1)).run(args.matrix)
+    except MatrixFileError as e:
+        parser.error(e.message)
+
+    for result in results:
+        status = "ok" if result.succeeded else f"failed: {result.error}"
+        print(f"{result.solution_name}: {status} ({result.solution_dir})")
+
+    if not all(result.succeeded for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Shared fixtures for the script tests. The scripts import each other flat, the same way
+they do when run from scripts/, so that directory goes on sys.path.
+
+Remotes are local bare repos. Slow or stalling remotes are served through git's ext::
+transport by a small shell script that sleeps before handing over to upload-pack.
+"""
+
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+requires_sh = pytest.mark.skipif(shutil.which('sh') is None,
+                                 reason="slow remotes are served by a shell script")
+
+
+def run_git(cwd, *args):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture(autouse=True)
+def git_env(monkeypatch):
+    """Gives commits an identity and allows the ext:: transport used for slow remotes."""
+    monkeypatch.setenv('GIT_AUTHOR_NAME', 'test')
+    monkeypatch.setenv('GIT_AUTHOR_EMAIL', 'test@example.com')
+    monkeypatch.setenv('GIT_COMMITTER_NAME', 'test')
+    monkeypatch.setenv('GIT_COMMITTER_EMAIL', 'test@example.com')
+    monkeypatch.setenv('GIT_CONFIG_COUNT', '1')
+    monkeypatch.setenv('GIT_CONFIG_KEY_0', 'protocol.ext.allow')
+    monkeypatch.setenv('GIT_CONFIG_VALUE_0', 'always')
+    monkeypatch.setenv('GIT_TERMINAL_PROMPT', '0')
+
+
+@pytest.fixture
+def make_bare_repo(tmp_path):
+    """
+    Returns a factory creating a bare repo with one commit on main, plus the given
+    lightweight tags, annotated tags and branches.
+    """
+    def make(name, tags=(), annotated_tags=(), branches=()):
+        work_dir = tmp_path / f"{name}-work"
+        work_dir.mkdir()
+        run_git(work_dir, "init", "-q", "-b", "main")
+        (work_dir / "README.md").write_text(name)
+        run_git(work_dir, "add", "README.md")
+        run_git(work_dir, "commit", "-q", "-m", "Initial commit")
+        for tag in tags:
+            run_git(work_dir, "tag", tag)
+        for tag in annotated_tags:
+            run_git(work_dir, "tag", "-a", tag, "-m", tag)
+        for branch in branches:
+            run_git(work_dir, "branch", branch)
+
+        bare_repo = tmp_path / f"{name}.git"
+        run_git(tmp_path, "clone", "-q", "--bare", str(work_dir), str(bare_repo))
+        return bare_repo
+    return make
+
+
+@pytest.fixture
+def make_slow_remote(tmp_path):
+    """
+    Returns a factory for ext:: urls serving a bare repo whose upload-pack waits delay
+    seconds. With delay_after_calls=n the first n requests (e.g. the probe) are answered
+    straight away and only later ones (e.g. the clone) are delayed.
+    """
+    created = []
+
+    def make(bare_repo, delay, delay_after_calls=0):
+        script_path = tmp_path / f"slow-remote-{len(created)}.sh"
+        script_path.write_text(
+            '#!/bin/sh\n'
+            'count_file="$0.count"\n'
+            'count=$(cat "$count_file" 2>/dev/null || echo 0)\n'
+            'echo $((count + 1)) > "$count_file"\n'
+            f'if [ "$count" -ge {delay_after_calls} ]; then sleep {delay}; fi\n'
+            'exec git upload-pack "$1"\n')
+        created.append(script_path)
+        return f"ext::sh {script_path.as_posix()} {Path(bare_repo).as_posix()}"
+    return make
@@ -0,0 +1,144 @@
+import http.client
+import http.server
+import threading
+import pytest
+from artifact_cache import (ARTIFACT_MARKER_FILENAME, ArtifactCache, ArtifactKey, ArtifactRequestHandler,
+                            DirectoryArtifactStore, has_artifact_marker)
+
+KEY = ArtifactKey(package="sfml", commit="a" * 40, presets_hash="b" * 64, toolchain="msvc-14.38.33130-x64",
+                  modules=("graphics", "window"))
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    build_dir = tmp_path / "source" / "build"
+    (build_dir / "lib").mkdir(parents=True)
+    (build_dir / "lib" / "sfml-graphics.lib").write_bytes(b"graphics")
+    (build_dir / "logs").mkdir()
+    (build_dir / "logs" / "debug.log.gz").write_bytes(b"log")
+    # Not one of ARTIFACT_SUBDIRS, so it stays behind.
+    (build_dir / "CMakeFiles").mkdir()
+    (build_dir / "CMakeFiles" / "rules.ninja").write_text("rules")
+    return build_dir
+
+
+@pytest.fixture
+def artifact_server(tmp_path):
+    """Serves a cache directory over HTTP the way `artifact_cache.py serve` does."""
+    root = tmp_path / "served"
+    root.mkdir()
+    handler = type('BoundArtifactRequestHandler', (ArtifactRequestHandler,),
+                   {'store': DirectoryArtifactStore(root), 'log_message': lambda *args: None})
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["directory", "http"])
+def cache_location(request, tmp_path):
+    """Returns (cache root on disk, location to open the cache with) for each backend."""
+    if request.param == "directory":
+        root = tmp_path / "cache"
+        return root, str(root)
+    return request.getfixturevalue("artifact_server")
+
+
+def test_publish_then_fetch_restores_build_outputs(tmp_path, build_dir, cache_location):
+    _, location = cache_location
+    cache = ArtifactCache.open(location)
+
+    assert not cache.has(KEY)
+    assert cache.publish(KEY, build_dir, ["lib", "logs", "reports"])
+    assert cache.has(KEY)
+
+    restored_dir = tmp_path / "other-machine" / "build"
+    assert cache.fetch(KEY, restored_dir)
+    assert (restored_dir / "lib" / "sfml-graphics.lib").read_bytes() == b"graphics"
+    assert (restored_dir / "logs" / "debug.log.gz").read_bytes() == b"log"
+    assert not (restored_dir / "CMakeFiles").exists()
+
+
+def test_fetch_of_unknown_key_returns_false(tmp_path, cache_location):
+    _, location = cache_location
+
+    assert not ArtifactCache.open(location).fetch(KEY, tmp_path / "build")
+    assert not (tmp_path / "build").exists()
+
+
+def test_fetch_rejects_archive_with_wrong_sha256(tmp_path, build_dir, cache_location, capsys):
+    root, location = cache_location
+    cache = ArtifactCache.open(location)
+    cache.publish(KEY, build_dir, ["lib"])
+
+    archive_path, = (root / KEY.package).glob("*.tar.gz")
+    archive_path.write_bytes(archive_path.read_bytes() + b"tampered")
+
+    restored_dir = tmp_path / "restored"
+    assert not cache.fetch(KEY, restored_dir)
+    assert "failed its integrity check" in capsys.readouterr().out
+    assert not restored_dir.exists()
+
+
+def test_keys_differing_in_any_input_are_separate_entries(build_dir, cache_location):
+    _, location = cache_location
+    cache = ArtifactCache.open(location)
+    cache.publish(KEY, build_dir, ["lib"])
+
+    assert not cache.has(ArtifactKey(**{**KEY.__dict__, "modules": ("graphics",)}))
+    assert not cache.has(ArtifactKey(**{**KEY.__dict__, "toolchain": "msvc-14.40.33807-x64"}))
+
+
+def test_publish_without_outputs_uploads_nothing(tmp_path, cache_location):
+    _, location = cache_location
+    cache = ArtifactCache.open(location)
+
+    assert not cache.publish(KEY, tmp_path / "empty", ["lib"])
+    assert not cache.has(KEY)
+
+
+def test_publish_and_fetch_mark_the_build_dir(tmp_path, build_dir):
+    cache = ArtifactCache.open(str(tmp_path / "cache"))
+    other_key = ArtifactKey(**{**KEY.__dict__, "commit": "c" * 40})
+
+    assert not has_artifact_marker(build_dir, KEY)
+    cache.publish(KEY, build_dir, ["lib"])
+    assert has_artifact_marker(build_dir, KEY)
+    assert not has_artifact_marker(build_dir, other_key)
+
+    restored_dir = tmp_path / "restored"
+    cache.fetch(KEY, restored_dir)
+    assert has_artifact_marker(restored_dir, KEY)
+    # The marker describes the local build dir, it's not part of the archive.
+    assert (build_dir / ARTIFACT_MARKER_FILENAME).is_file()
+
+
+@pytest.mark.parametrize("name", ["../outside.ref.json", "sfml/../../outside.ref.json", "/etc/passwd"])
+def test_directory_store_rejects_names_escaping_its_root(tmp_path, name):
+    store = DirectoryArtifactStore(tmp_path / "cache")
+    source_path = tmp_path / "blob"
+    source_path.write_bytes(b"blob")
+
+    with pytest.raises(ValueError):
+        store.put(name, source_path)
+    with pytest.raises(ValueError):
+        store.get(name, tmp_path / "copy")
+    assert not (tmp_path / "outside.ref.json").exists()
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD", "PUT"])
+def test_server_rejects_names_escaping_its_root(tmp_path, artifact_server, method):
+    root, url = artifact_server
+    (tmp_path / "secret").write_bytes(b"secret")
+
+    connection = http.client.HTTPConnection(url.removeprefix("http://"), timeout=10)
+    body = b"blob" if method == "PUT" else None
+    connection.request(method, "/../secret", body=body)
+    response = connection.getresponse()
+    response.read()
+    connection.close()
+
+    assert response.status == 400
+    assert (tmp_path / "secret").read_bytes() == b"secret"
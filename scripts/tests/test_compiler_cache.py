@@ -0,0 +1,47 @@
+import pytest
+from compiler_cache import (UnsupportedCompilerLauncherError, inject_compiler_launcher,
+                            strip_compiler_cache_environment)
+
+
+def make_presets(minor=23):
+    return {
+        "version": 6,
+        "cmakeMinimumRequired": {"major": 3, "minor": minor, "patch": 0},
+        "configurePresets": [{"name": "default", "cacheVariables": {"BUILD_SHARED_LIBS": "OFF"}}],
+    }
+
+
+@pytest.mark.parametrize("launcher", ["ccache", "sccache"])
+def test_launcher_embeds_debug_info_and_requires_cmake_that_honors_it(launcher):
+    presets = make_presets()
+
+    inject_compiler_launcher(presets, launcher)
+
+    cache_variables = presets["configurePresets"][0]["cacheVariables"]
+    assert cache_variables["CMAKE_CXX_COMPILER_LAUNCHER"] == launcher
+    assert cache_variables["CMAKE_MSVC_DEBUG_INFORMATION_FORMAT"] == "Embedded"
+    assert cache_variables["BUILD_SHARED_LIBS"] == "OFF"
+    assert presets["cmakeMinimumRequired"] == {"major": 3, "minor": 25, "patch": 0}
+
+
+def test_newer_cmake_requirement_is_kept():
+    presets = make_presets(minor=28)
+
+    inject_compiler_launcher(presets, "ccache")
+
+    assert presets["cmakeMinimumRequired"] == {"major": 3, "minor": 28, "patch": 0}
+
+
+def test_unsupported_launcher_is_rejected():
+    with pytest.raises(UnsupportedCompilerLauncherError):
+        inject_compiler_launcher(make_presets(), "distcc")
+
+
+def test_machine_specific_paths_are_stripped_from_hashed_presets():
+    presets = make_presets()
+    inject_compiler_launcher(presets, "ccache", cache_dir="D:/ccache", base_dir="D:/packages")
+
+    stripped_presets = strip_compiler_cache_environment(presets)
+
+    assert "environment" not in stripped_presets["configurePresets"][0]
+    assert presets["configurePresets"][0]["environment"]["CCACHE_DIR"] == "D:/ccache"
@@ -0,0 +1,132 @@
+import time
+from conftest import requires_sh
+from git_helper import GitHelper
+from mirror_selector import MirrorSelector, MirrorStats, MIRROR_STATS_FILENAME
+
+
+def make_selector(tmp_path, **kwargs):
+    return MirrorSelector(MirrorStats(tmp_path / MIRROR_STATS_FILENAME), **kwargs)
+
+
+@requires_sh
+def test_rank_orders_mirrors_by_latency(tmp_path, make_bare_repo, make_slow_remote):
+    bare_repo = make_bare_repo("package")
+    slow_url = make_slow_remote(bare_repo, delay=1)
+    fast_url = str(bare_repo)
+
+    assert make_selector(tmp_path).rank([slow_url, fast_url]) == [fast_url, slow_url]
+
+
+def test_rank_drops_failed_mirror_and_reports_why(tmp_path, make_bare_repo, capsys):
+    fast_url = str(make_bare_repo("package"))
+    missing_url = str(tmp_path / "missing.git")
+
+    assert make_selector(tmp_path).rank([missing_url, fast_url]) == [fast_url]
+
+    output = capsys.readouterr().out
+    assert f"Mirror {missing_url} failed its probe:" in output
+    assert "did not answer" not in output
+
+
+@requires_sh
+def test_rank_drops_mirror_that_times_out(tmp_path, make_bare_repo, make_slow_remote, capsys):
+    bare_repo = make_bare_repo("package")
+    stalled_url = make_slow_remote(bare_repo, delay=5)
+
+    assert make_selector(tmp_path, probe_timeout=0.5).rank([stalled_url, str(bare_repo)]) == [str(bare_repo)]
+    assert "did not answer within 0.5s" in capsys.readouterr().out
+
+
+FAST_URL = "https://fast.example/repo.git"
+SLOW_URL = "https://slow.example/repo.git"
+
+
+def measure(stats, url, latency, megabytes_per_second):
+    stats.record_probe(url, latency)
+    stats.record_transfer(url, megabytes_per_second * 1024 * 1024, 1.0)
+
+
+def test_rank_puts_failing_mirrors_last(tmp_path):
+    stats = MirrorStats(tmp_path / MIRROR_STATS_FILENAME)
+    measure(stats, FAST_URL, 0.01, megabytes_per_second=100)
+    measure(stats, SLOW_URL, 2.0, megabytes_per_second=10)
+    stats.record_failure(FAST_URL)
+
+    assert stats.rank_key(SLOW_URL) < stats.rank_key(FAST_URL)
+
+
+def test_mirror_that_failed_once_is_ranked_by_speed_after_answering_a_probe(tmp_path):
+    stats = MirrorStats(tmp_path / MIRROR_STATS_FILENAME)
+    measure(stats, FAST_URL, 0.05, megabytes_per_second=100)
+    measure(stats, SLOW_URL, 0.05, megabytes_per_second=10)
+    stats.record_probe(FAST_URL, None)
+
+    assert stats.rank_key(SLOW_URL) < stats.rank_key(FAST_URL)
+
+    stats.record_probe(FAST_URL, 0.05)
+    stats.record_probe(SLOW_URL, 0.05)
+
+    assert stats.rank_key(FAST_URL) < stats.rank_key(SLOW_URL)
+
+
+def test_mirror_that_keeps_failing_takes_several_good_probes_to_recover(tmp_path):
+    stats = MirrorStats(tmp_path / MIRROR_STATS_FILENAME)
+    measure(stats, FAST_URL, 0.05, megabytes_per_second=100)
+    measure(stats, SLOW_URL, 0.05, megabytes_per_second=10)
+    for _ in range(3):
+        stats.record_failure(FAST_URL)
+
+    stats.record_probe(FAST_URL, 0.05)
+    assert stats.rank_key(SLOW_URL) < stats.rank_key(FAST_URL)
+
+    stats.record_probe(FAST_URL, 0.05)
+    assert stats.rank_key(FAST_URL) < stats.rank_key(SLOW_URL)
+
+
+def test_clone_falls_back_when_probe_fails(tmp_path, make_bare_repo):
+    fast_url = str(make_bare_repo("package"))
+    missing_url = str(tmp_path / "missing.git")
+    repo_path = tmp_path / "cache" / "package"
+
+    selector = make_selector(tmp_path)
+    assert selector.clone(repo_path, [missing_url, fast_url]) == fast_url
+    assert GitHelper.does_repo_exist(repo_path)
+
+    reloaded_stats = MirrorStats(tmp_path / MIRROR_STATS_FILENAME)
+    assert reloaded_stats.entries[missing_url]["failures"] == 1
+    assert reloaded_stats.entries[fast_url]["throughput"] is not None
+
+
+@requires_sh
+def test_clone_falls_back_when_best_mirror_stalls(tmp_path, make_bare_repo, make_slow_remote):
+    bare_repo = make_bare_repo("package")
+    # Answers its probe fastest, so it's tried first, then never sends the pack.
+    stalling_url = make_slow_remote(bare_repo, delay=30, delay_after_calls=1)
+    backup_url = make_slow_remote(bare_repo, delay=0.5)
+    repo_path = tmp_path / "cache" / "package"
+
+    start = time.monotonic()
+    cloned_url = make_selector(tmp_path, stall_timeout=1).clone(repo_path, [stalling_url, backup_url])
+
+    assert cloned_url == backup_url
+    assert GitHelper.does_repo_exist(repo_path)
+    assert time.monotonic() - start < 20
+
+
+@requires_sh
+def test_clone_with_stall_timeout_kills_stalled_clone(tmp_path, make_bare_repo, make_slow_remote):
+    stalling_url = make_slow_remote(make_bare_repo("package"), delay=30)
+    repo_path = tmp_path / "cache" / "package"
+
+    start = time.monotonic()
+    assert not GitHelper.clone_with_stall_timeout(repo_path, stalling_url, stall_timeout=1)
+    assert time.monotonic() - start < 20
+    assert not repo_path.exists()
+
+
+def test_every_mirror_failing_returns_none(tmp_path):
+    repo_path = tmp_path / "cache" / "package"
+    urls = [str(tmp_path / "missing-1.git"), str(tmp_path / "missing-2.git")]
+
+    assert make_selector(tmp_path).clone(repo_path, urls) is None
+    assert not repo_path.exists()
@@ -0,0 +1,47 @@
+import json
+from conftest import run_git
+from git_helper import GitHelper
+from package_archive import export_package_archive, import_package_archive
+
+
+def seed_cache(package_cache_path, package_name, version, bare_repo, checkout=None):
+    repo_path = package_cache_path / package_name / version / package_name
+    repo_path.parent.mkdir(parents=True)
+    run_git(repo_path.parent, "clone", "-q", str(bare_repo), package_name)
+    run_git(repo_path, "checkout", "-q", checkout or version)
+    (repo_path / "build" / "lib").mkdir(parents=True)
+    (repo_path / "build" / "lib" / f"{package_name}.lib").write_bytes(b"lib")
+    return repo_path
+
+
+def write_dependencies(tmp_path, dependencies):
+    dependencies_path = tmp_path / "dependencies.json"
+    dependencies_path.write_text(json.dumps(dependencies))
+    return dependencies_path
+
+
+def test_export_then_import_restores_checkouts_and_build_outputs(tmp_path, make_bare_repo):
+    bare_repo = make_bare_repo("spdlog", annotated_tags=["v1.12.0"])
+    seed_cache(tmp_path / "cache", "spdlog", "v1.12.0", bare_repo)
+    dependencies_path = write_dependencies(tmp_path, {"spdlog": "git|v1.12.0", "spdlog_modules": []})
+    archive_path = tmp_path / "packages.tar"
+
+    assert export_package_archive(dependencies_path, tmp_path / "cache", archive_path) == ["spdlog"]
+    assert import_package_archive(archive_path, tmp_path / "offline-cache") == ["spdlog"]
+
+    repo_path = tmp_path / "offline-cache" / "spdlog" / "v1.12.0" / "spdlog"
+    assert GitHelper.is_correct_version(repo_path, "v1.12.0")
+    assert GitHelper.get_remote_url(repo_path) == str(bare_repo)
+    assert (repo_path / "build" / "lib" / "spdlog.lib").read_bytes() == b"lib"
+
+
+def test_import_reports_version_missing_from_bundle(tmp_path, make_bare_repo, capsys):
+    # The cache dir says v2.0.0, but the checkout was never tagged with it.
+    seed_cache(tmp_path / "cache", "spdlog", "v2.0.0", make_bare_repo("spdlog"), checkout="main")
+    dependencies_path = write_dependencies(tmp_path, {"spdlog": "v2.0.0"})
+    archive_path = tmp_path / "packages.tar"
+    export_package_archive(dependencies_path, tmp_path / "cache", archive_path)
+
+    assert import_package_archive(archive_path, tmp_path / "offline-cache") == []
+    assert "Failed to check out spdlog v2.0.0" in capsys.readouterr().out
+    assert not (tmp_path / "offline-cache" / "spdlog" / "v2.0.0" / "spdlog").exists()
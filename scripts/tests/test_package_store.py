@@ -0,0 +1,44 @@
+import json
+import os
+from package_store import PACKAGE_INDEX_FILENAME, PACKAGE_MANIFEST_FILENAME, PackageStore
+
+
+def write_manifest(supported_packages_dir, package_name, **fields):
+    package_dir = supported_packages_dir / package_name
+    package_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"git_url": f"https://example.com/{package_name}.git", "versions": ["1.0.0"], **fields}
+    manifest_path = package_dir / PACKAGE_MANIFEST_FILENAME
+    manifest_path.write_text(json.dumps(manifest))
+    return manifest_path
+
+
+def load_store(tmp_path):
+    store = PackageStore(tmp_path / "supported-packages", tmp_path / "generated" / PACKAGE_INDEX_FILENAME)
+    store.load_index()
+    return store
+
+
+def test_packages_are_listed_in_manifest_order_then_by_name(tmp_path):
+    supported_packages_dir = tmp_path / "supported-packages"
+    write_manifest(supported_packages_dir, "asio", order=2)
+    write_manifest(supported_packages_dir, "spdlog", order=1)
+    write_manifest(supported_packages_dir, "zlib")
+    write_manifest(supported_packages_dir, "fmt")
+
+    assert list(load_store(tmp_path)) == ["spdlog", "asio", "fmt", "zlib"]
+
+
+def test_reordering_a_manifest_reorders_the_index(tmp_path):
+    supported_packages_dir = tmp_path / "supported-packages"
+    write_manifest(supported_packages_dir, "asio", order=1)
+    spdlog_manifest = write_manifest(supported_packages_dir, "spdlog", order=2)
+    assert list(load_store(tmp_path)) == ["asio", "spdlog"]
+
+    write_manifest(supported_packages_dir, "spdlog", order=0)
+    # Make sure the edit is visible even on filesystems with coarse mtimes.
+    mtime_ns = spdlog_manifest.stat().st_mtime_ns + 1_000_000_000
+    os.utime(spdlog_manifest, ns=(mtime_ns, mtime_ns))
+
+    assert list(load_store(tmp_path)) == ["spdlog", "asio"]
+    saved_index = json.loads((tmp_path / "generated" / PACKAGE_INDEX_FILENAME).read_text())
+    assert list(saved_index) == ["spdlog", "asio"]
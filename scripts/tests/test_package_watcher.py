@@ -0,0 +1,206 @@
+import json
+import pytest
+from package_pipeline import PackagePipeline
+from package_watcher import (ChangeKind, InputChange, InputSnapshot, PackageWatcher, StagePlan,
+                             classify_changes, plan_stages)
+
+DEBOUNCE_SECONDS = 1.0
+
+
+def make_snapshot(dependencies=None, source_projects=(), static_projects=(), package_files=None):
+    return InputSnapshot(
+        dependencies={"sfml": "2.6.1", "spdlog": "v1.12.0"} if dependencies is None else dependencies,
+        source_projects=frozenset(source_projects),
+        static_projects=frozenset(static_projects),
+        package_files={
+            "sfml/package.json": 1,
+            "sfml/2.6.1/config.lua": 1,
+            "sfml/2.6.1/CMakePresets.json": 1,
+            "spdlog/package.json": 1,
+            "spdlog/v1.12.0/premake.lua": 1,
+            "spdlog/ac55e604/premake.lua": 1,
+            "glm/package.json": 1,
+        } if package_files is None else package_files,
+    )
+
+
+def touch(snapshot, *paths):
+    package_files = dict(snapshot.package_files)
+    for path in paths:
+        package_files[path] = package_files.get(path, 0) + 1
+    return make_snapshot(snapshot.dependencies, snapshot.source_projects, snapshot.static_projects,
+                         package_files)
+
+
+@pytest.mark.parametrize("new, expected_changes, expected_plan", [
+    (make_snapshot({"sfml": "2.5.1", "spdlog": "v1.12.0"}),
+     [InputChange(ChangeKind.VERSION, "sfml")],
+     StagePlan(fetch={"sfml"}, build={"sfml"}, package_info=True, premake=True)),
+    (make_snapshot({"sfml": "2.6.1", "spdlog": "v1.12.0", "sfml_modules": ["graphics"]}),
+     [InputChange(ChangeKind.MODULES, "sfml")],
+     StagePlan(build={"sfml"}, package_info=True, premake=True)),
+    (touch(make_snapshot(), "sfml/package.json"),
+     [InputChange(ChangeKind.PACKAGE_MANIFEST, "sfml")],
+     StagePlan(build={"sfml"}, package_info=True, premake=True)),
+    (make_snapshot(source_projects={"game"}),
+     [InputChange(ChangeKind.SOURCE_PROJECT)],
+     StagePlan(premake=True)),
+    (make_snapshot(static_projects={"engine"}),
+     [InputChange(ChangeKind.STATIC_PROJECT)],
+     StagePlan(package_info=True, premake=True)),
+    (touch(make_snapshot(), "spdlog/v1.12.0/premake.lua"),
+     [InputChange(ChangeKind.PACKAGE_SCRIPT, "spdlog")],
+     StagePlan(premake=True)),
+    (touch(make_snapshot(), "sfml/2.6.1/CMakePresets.json"),
+     [InputChange(ChangeKind.PACKAGE_PRESETS, "sfml")],
+     StagePlan(build={"sfml"})),
+], ids=["version", "modules", "manifest", "source_project", "static_project", "script", "presets"])
+def test_changes_map_to_stages(new, expected_changes, expected_plan):
+    changes = classify_changes(make_snapshot(), new)
+
+    assert changes == expected_changes
+    assert plan_stages(changes) == expected_plan
+
+
+def test_edits_to_unselected_packages_and_versions_are_ignored():
+    new = touch(make_snapshot(), "glm/package.json", "spdlog/ac55e604/premake.lua")
+
+    assert classify_changes(make_snapshot(), new) == []
+    assert plan_stages([]).is_empty()
+
+
+def test_removing_a_package_is_a_version_change():
+    changes = classify_changes(make_snapshot(), make_snapshot({"sfml": "2.6.1"}))
+
+    assert changes == [InputChange(ChangeKind.VERSION, "spdlog")]
+
+
+def test_several_edits_to_one_package_are_reported_once():
+    new = touch(make_snapshot(), "spdlog/v1.12.0/premake.lua", "spdlog/v1.12.0/extra.lua")
+
+    assert classify_changes(make_snapshot(), new) == [InputChange(ChangeKind.PACKAGE_SCRIPT, "spdlog")]
+
+
+def test_version_strings_with_a_source_prefix_match_their_script_dir():
+    old = make_snapshot({"sfml": "git|2.6.1"})
+
+    changes = classify_changes(old, touch(old, "sfml/2.6.1/config.lua"))
+
+    assert changes == [InputChange(ChangeKind.PACKAGE_SCRIPT, "sfml")]
+
+
+class ScriptedWatcher(PackageWatcher):
+    """Records each apply and fails it while failures are queued."""
+    def __init__(self, pipeline, failures):
+        super().__init__(pipeline, "solution", debounce_seconds=DEBOUNCE_SECONDS)
+        self.failures = list(failures)
+        self.applied = []
+
+    def apply(self, changes, plan, snapshot):
+        self.applied.append(snapshot.dependencies)
+        failure = self.failures.pop(0) if self.failures else None
+        if isinstance(failure, Exception):
+            raise failure
+        return failure is None
+
+
+def write_dependencies(pipeline, dependencies):
+    with open(pipeline.dependencies_path, 'w', encoding='utf-8') as file:
+        json.dump(dependencies, file)
+
+
+def settle(watcher, now):
+    """Polls once to see the change, then again after the debounce."""
+    assert watcher.poll(now) is None
+    return watcher.poll(now + DEBOUNCE_SECONDS)
+
+
+def make_pipeline(tmp_path):
+    pipeline = PackagePipeline(tmp_path, status_callback=print)
+    write_dependencies(pipeline, {"glm": "1.0.1"})
+    return pipeline
+
+
+def test_changes_are_applied_after_debounce(tmp_path):
+    pipeline = make_pipeline(tmp_path)
+    watcher = ScriptedWatcher(pipeline, failures=[])
+
+    write_dependencies(pipeline, {"glm": "1.0.0"})
+    plan = settle(watcher, now=10.0)
+
+    assert plan.fetch == {"glm"}
+    assert watcher.applied == [{"glm": "1.0.0"}]
+    assert watcher.applied_snapshot.dependencies == {"glm": "1.0.0"}
+
+
+def test_failed_apply_keeps_previous_snapshot_and_retries_after_next_edit(tmp_path, capsys):
+    pipeline = make_pipeline(tmp_path)
+    watcher = ScriptedWatcher(pipeline, failures=[RuntimeError("cmake exploded")])
+
+    write_dependencies(pipeline, {"glm": "1.0.0"})
+    settle(watcher, now=10.0)
+
+    assert "Error: Update failed: cmake exploded" in capsys.readouterr().out
+    assert watcher.applied_snapshot.dependencies == {"glm": "1.0.1"}
+
+    # Not retried in a loop while nothing changes.
+    assert watcher.poll(20.0) is None
+    assert len(watcher.applied) == 1
+
+    write_dependencies(pipeline, {"glm": "1.0.0", "spdlog": "v1.12.0"})
+    plan = settle(watcher, now=30.0)
+
+    # The retry still includes the glm change that failed the first time.
+    assert plan.fetch == {"glm", "spdlog"}
+    assert watcher.applied_snapshot.dependencies == {"glm": "1.0.0", "spdlog": "v1.12.0"}
+
+
+def test_stage_reporting_failure_is_retried_after_next_edit(tmp_path):
+    pipeline = make_pipeline(tmp_path)
+    watcher = ScriptedWatcher(pipeline, failures=[False])
+
+    write_dependencies(pipeline, {"glm": "1.0.0"})
+    settle(watcher, now=10.0)
+    assert watcher.applied_snapshot.dependencies == {"glm": "1.0.1"}
+
+    write_dependencies(pipeline, {"glm": "0.9.9"})
+    settle(watcher, now=20.0)
+    assert watcher.applied == [{"glm": "1.0.0"}, {"glm": "0.9.9"}]
+    assert watcher.applied_snapshot.dependencies == {"glm": "0.9.9"}
+
+
+class FailingBuildPipeline(PackagePipeline):
+    """Runs apply()'s stages without touching git, CMake or premake. Every build fails."""
+    def __init__(self, sln_dir):
+        super().__init__(sln_dir, status_callback=print)
+        self.stages = []
+
+    def load_package_store(self):
+        pass
+
+    def fetch_packages(self, checked_packages):
+        self.stages.append("fetch")
+        return True
+
+    def build_packages(self, checked_packages):
+        self.stages.append("build")
+        return False
+
+    def generate_package_info_lua(self, checked_packages):
+        self.stages.append("package_info")
+
+    def execute_premake(self, solution_dir, solution_name):
+        self.stages.append("premake")
+        return True
+
+
+def test_failed_build_stops_apply_and_is_retried(tmp_path):
+    pipeline = FailingBuildPipeline(tmp_path)
+    write_dependencies(pipeline, {"sfml": "2.6.1"})
+    watcher = PackageWatcher(pipeline, "solution", debounce_seconds=DEBOUNCE_SECONDS)
+
+    write_dependencies(pipeline, {"sfml": "2.5.1"})
+    settle(watcher, now=10.0)
+
+    assert pipeline.stages == ["fetch", "build"]
+    assert watcher.applied_snapshot.dependencies == {"sfml": "2.6.1"}
@@ -0,0 +1,59 @@
+import json
+import pytest
+from package_pipeline import PackagePipeline, SLN_DIR
+from solution_matrix import MatrixFileError, get_shared_builds, load_matrix
+
+
+def write_matrix(tmp_path, matrix):
+    matrix_path = tmp_path / "matrices" / "prototypes.json"
+    matrix_path.parent.mkdir(parents=True, exist_ok=True)
+    matrix_path.write_text(json.dumps(matrix))
+    return matrix_path
+
+
+def test_output_dir_defaults_to_the_matrix_dir(tmp_path):
+    matrix_path = write_matrix(tmp_path, {"solutions": {"a": {}}})
+
+    assert load_matrix(matrix_path)[0] == tmp_path / "matrices"
+
+
+def test_relative_output_dir_is_relative_to_the_matrix_file(tmp_path, monkeypatch):
+    matrix_path = write_matrix(tmp_path, {"output_dir": "../prototypes", "solutions": {"a": {}}})
+    monkeypatch.chdir(SLN_DIR)
+
+    assert load_matrix(matrix_path)[0].resolve() == tmp_path / "prototypes"
+
+
+def test_absolute_output_dir_is_used_as_is(tmp_path):
+    matrix_path = write_matrix(tmp_path, {"output_dir": str(tmp_path / "elsewhere"), "solutions": {"a": {}}})
+
+    assert load_matrix(matrix_path)[0] == tmp_path / "elsewhere"
+
+
+def test_matrix_without_solutions_is_rejected(tmp_path):
+    with pytest.raises(MatrixFileError):
+        load_matrix(write_matrix(tmp_path, {"solutions": {}}))
+
+
+def test_shared_builds_union_module_selections():
+    shared_builds = get_shared_builds({
+        "a": {"sfml": "2.6.1", "sfml_modules": ["graphics"]},
+        "b": {"sfml": "2.6.1", "sfml_modules": ["audio", "graphics"]},
+        "c": {"sfml": "2.5.1", "spdlog": "v1.12.0"},
+    })
+
+    assert shared_builds == {
+        ("sfml", "2.6.1"): ["graphics", "audio"],
+        ("sfml", "2.5.1"): None,
+        ("spdlog", "v1.12.0"): None,
+    }
+
+
+def test_generated_solutions_get_the_scripts_but_not_their_tests(tmp_path):
+    solution_dir = tmp_path / "solution"
+
+    PackagePipeline(SLN_DIR).create_solution_dir(solution_dir, "solution", dependencies={})
+
+    assert (solution_dir / "scripts" / "bootstrapper.py").is_file()
+    assert not (solution_dir / "scripts" / "tests").exists()
+    assert not list((solution_dir / "scripts").rglob("__pycache__"))
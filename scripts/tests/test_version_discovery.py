@@ -0,0 +1,190 @@
+import json
+import shutil
+import threading
+import time
+from version_discovery import VersionIndex, VERSION_INDEX_FILENAME, parse_ls_remote
+
+COMMIT = "a" * 40
+TAG_OBJECT = "b" * 40
+
+
+def test_parse_ls_remote_splits_tags_and_branches():
+    output = (f"{COMMIT}\trefs/heads/main\n"
+              f"{COMMIT}\trefs/tags/v1.0.0\n"
+              f"{COMMIT}\trefs/heads/develop\n")
+
+    assert parse_ls_remote(output) == (["v1.0.0"], ["main", "develop"])
+
+
+def test_parse_ls_remote_collapses_peeled_annotated_tags():
+    output = (f"{TAG_OBJECT}\trefs/tags/v1.1.0\n"
+              f"{COMMIT}\trefs/tags/v1.1.0^{{}}\n"
+              f"{COMMIT}\trefs/tags/v1.0.0\n")
+
+    assert parse_ls_remote(output) == (["v1.1.0", "v1.0.0"], [])
+
+
+def test_parse_ls_remote_skips_other_refs_and_noise():
+    output = (f"{COMMIT}\tHEAD\n"
+              f"{COMMIT}\trefs/pull/1/head\n"
+              "warning: redirecting to https://example.com/repo.git/\n")
+
+    assert parse_ls_remote(output) == ([], [])
+
+
+def test_refresh_discovers_versions_from_remote(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"], annotated_tags=["v1.2.0"],
+                                 branches=["develop"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+
+    refreshed = index.refresh({"package": git_url})
+
+    assert refreshed == {"package": ["v1.2.0", "v1.0.0", "main", "develop"]}
+    assert index.get_versions("package", git_url) == refreshed["package"]
+    assert VersionIndex(tmp_path / VERSION_INDEX_FILENAME).get_versions("package", git_url) == refreshed["package"]
+
+
+def test_fresh_entries_are_not_queried_again(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+    index.refresh({"package": git_url})
+
+    assert not index.is_stale("package", git_url)
+    assert index.refresh({"package": git_url}) == {}
+
+
+def test_entries_go_stale_after_ttl(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME, ttl_seconds=60)
+    index.refresh({"package": git_url})
+
+    index.entries["package"]["fetched_at"] = time.time() - 61
+
+    assert index.is_stale("package", git_url)
+    assert index.refresh({"package": git_url}) == {"package": ["v1.0.0", "main"]}
+    assert not index.is_stale("package", git_url)
+
+
+def test_url_change_invalidates_entry(tmp_path, make_bare_repo):
+    old_url = str(make_bare_repo("old", tags=["v1.0.0"]))
+    new_url = str(make_bare_repo("new", tags=["v2.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+    index.refresh({"package": old_url})
+
+    assert index.is_stale("package", new_url)
+    assert index.get_versions("package", new_url) == []
+
+    index.refresh({"package": new_url})
+    assert index.get_versions("package", new_url) == ["v2.0.0", "main"]
+
+
+def test_failed_refresh_keeps_cached_versions(tmp_path, make_bare_repo):
+    bare_repo = make_bare_repo("package", tags=["v1.0.0"])
+    git_url = str(bare_repo)
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+    index.refresh({"package": git_url})
+    fetched_at = index.entries["package"]["fetched_at"]
+
+    shutil.rmtree(bare_repo)
+
+    assert index.refresh({"package": git_url}, force=True) == {}
+    assert index.get_versions("package", git_url) == ["v1.0.0", "main"]
+    assert index.entries["package"]["fetched_at"] == fetched_at
+
+
+def test_one_failing_remote_does_not_block_the_others(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+
+    refreshed = index.refresh({"package": git_url, "missing": str(tmp_path / "missing.git")})
+
+    assert refreshed == {"package": ["v1.0.0", "main"]}
+    assert "missing" not in index.entries
+
+
+def test_unreadable_index_starts_empty(tmp_path):
+    index_path = tmp_path / VERSION_INDEX_FILENAME
+    index_path.write_text("{ not json")
+
+    assert VersionIndex(index_path).entries == {}
+
+
+def test_refresh_in_background_calls_back_with_refreshed_versions(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+    results = []
+    called = threading.Event()
+
+    def on_refreshed(refreshed):
+        results.append(refreshed)
+        called.set()
+
+    thread = index.refresh_in_background({"package": git_url}, on_refreshed)
+
+    assert called.wait(timeout=30)
+    thread.join(timeout=30)
+    assert results == [{"package": ["v1.0.0", "main"]}]
+    assert json.loads((tmp_path / VERSION_INDEX_FILENAME).read_text())["package"]["git_url"] == git_url
+
+
+def test_refresh_in_background_skips_callback_when_nothing_refreshed(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+    index.refresh({"package": git_url})
+    results = []
+
+    index.refresh_in_background({"package": git_url}, results.append).join(timeout=30)
+
+    assert results == []
+
+
+def test_concurrent_saves_of_a_shared_index_all_succeed(tmp_path, make_bare_repo):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index_path = tmp_path / VERSION_INDEX_FILENAME
+    VersionIndex(index_path).refresh({"package": git_url})
+    # Separate instances, like separate GUIs sharing the package cache.
+    indexes = [VersionIndex(index_path) for _ in range(8)]
+    start = threading.Barrier(len(indexes))
+    errors = []
+
+    def save_repeatedly(index):
+        start.wait()
+        for _ in range(50):
+            try:
+                index._save()
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=save_repeatedly, args=(index,)) for index in indexes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert errors == []
+    assert VersionIndex(index_path).get_versions("package", git_url) == ["v1.0.0", "main"]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_refresh_in_background_reports_errors(tmp_path, monkeypatch, capsys):
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+
+    def broken_refresh(git_urls, force=False):
+        raise RuntimeError("ls-remote exploded")
+    monkeypatch.setattr(index, "refresh", broken_refresh)
+
+    index.refresh_in_background({"package": "https://example.com/repo.git"}).join(timeout=30)
+
+    assert "Version discovery failed: ls-remote exploded" in capsys.readouterr().out
+
+
+def test_unsaved_index_still_reports_refreshed_versions(tmp_path, make_bare_repo, monkeypatch, capsys):
+    git_url = str(make_bare_repo("package", tags=["v1.0.0"]))
+    index = VersionIndex(tmp_path / VERSION_INDEX_FILENAME)
+
+    def failing_save():
+        raise PermissionError("read-only share")
+    monkeypatch.setattr(index, "_save", failing_save)
+
+    assert index.refresh({"package": git_url}) == {"package": ["v1.0.0", "main"]}
+    assert "Could not save version index" in capsys.readouterr().out
@@ -0,0 +1,100 @@
+"""
+This module generates unity (jumbo) source files. A unity file is a .cpp that #includes
+a batch of other .cpp files, so the compiler parses shared headers once per batch instead
+of once per file. Some files don't combine cleanly (anonymous namespace clashes, macros that
+leak, etc.) so callers pass an exclude list, and those files keep compiling on their own.
+"""
+
+
+import json
+import os
+from pathlib import Path
+
+UNITY_MANIFEST_FILENAME = 'unity_manifest.json'
+UNITY_FILE_PREFIX = 'unity_'
+
+
+def find_sources(source_dirs, exclude=(), extensions=('.cpp',)):
+    """
+    Walks source_dirs for files with the given extensions.
+
+    Args:
+        source_dirs (list[Path]): Directories to search recursively.
+        exclude (list[Path]): Files that should not be batched.
+        extensions (tuple[str]): File extensions that count as sources.
+
+    Returns:
+        Sorted list[Path] of source files, so batches stay stable between runs.
+    """
+    excluded = {Path(path).resolve() for path in exclude}
+    sources = []
+    for source_dir in source_dirs:
+        for root, _, filenames in os.walk(source_dir):
+            for filename in filenames:
+                file_path = Path(root, filename).resolve()
+                if file_path.suffix in extensions and file_path not in excluded:
+                    sources.append(file_path)
+    return sorted(sources)
+
+
+class UnityBuildGenerator:
+    def __init__(self, output_dir, batch_size):
+        self.output_dir = Path(output_dir)
+        self.batch_size = batch_size
+
+    def generate(self, project_name, sources):
+        """
+        Writes the unity files for a project. Nothing is rewritten if the set of sources
+        and batch size match what was generated last time, so the unity files keep their
+        timestamps and don't trigger a rebuild.
+
+        Args:
+            project_name (str): Used to name the output directory for this project.
+            sources (list[Path]): The source files to batch.
+
+        Returns:
+            list[Path] of generated unity files. Empty if there were fewer than two sources,
+            since there is nothing to gain from batching a single file.
+        """
+        if len(sources) < 2:
+            return []
+
+        project_dir = self.output_dir / project_name
+        manifest_path = project_dir / UNITY_MANIFEST_FILENAME
+        manifest = {
+            'batch_size': self.batch_size,
+            'sources': [Path(source).as_posix() for source in sources],
+        }
+
+        batches = [manifest['sources'][i:i + self.batch_size]
+                   for i in range(0, len(manifest['sources']), self.batch_size)]
+        unit_paths = [project_dir / f"{UNITY_FILE_PREFIX}{index}.cpp" for index in range(len(batches))]
+
+        if self._is_up_to_date(manifest_path, manifest, unit_paths):
+            print(f"Unity files for {project_name} are up to date.")
+            return unit_paths
+
+        print(f"Generating {len(unit_paths)} unity files for {project_name}.")
+        project_dir.mkdir(parents=True, exist_ok=True)
+        for stale_unit in project_dir.glob(f"{UNITY_FILE_PREFIX}*.cpp"):
+            if stale_unit not in unit_paths:
+                stale_unit.unlink()
+
+        for unit_path, batch in zip(unit_paths, batches):
+            with open(unit_path, 'w', encoding='utf-8') as unit_file:
+                unit_file.write('// Generated by scripts/unity_build.py. Do not edit.\n')
+                for source in batch:
+                    unit_file.write(f'#include "{source}"\n')
+
+        with open(manifest_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=4)
+
+        return unit_paths
+
+    @staticmethod
+    def _is_up_to_date(manifest_path, manifest, unit_paths):
+        if not manifest_path.is_file():
+            return False
+        with open(manifest_path, encoding='utf-8') as file:
+            previous_manifest = json.load(file)
+        return previous_manifest == manifest and all(unit.is_file() for unit in unit_paths)
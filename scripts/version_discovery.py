@@ -0,0 +1,163 @@
+"""
+This module discovers the tags and branches each package's remote offers, so the version
+dropdowns aren't limited to what someone typed into each package's package.json.
+
+Asking every remote on every launch would make startup slow, so results are kept in a
+local index with a TTL. The GUI reads the index straight away and refreshes stale entries
+in the background, querying all remotes in parallel.
+"""
+
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from git_helper import GitHelper
+
+VERSION_INDEX_FILENAME = 'version_index.json'
+
+# A day is plenty. Upstream tags don't move fast.
+DEFAULT_VERSION_INDEX_TTL_SECONDS = 24 * 60 * 60
+MAX_DISCOVERY_WORKERS = 8
+
+
+def parse_ls_remote(output):
+    """
+    Splits ls-remote output into tag and branch names, keeping the remote's order.
+
+    Returns:
+        tuple[list[str], list[str]] of (tags, branches).
+    """
+    tags = []
+    branches = []
+    for line in output.splitlines():
+        parts = line.split('\t')
+        if len(parts) != 2:
+            continue
+        ref = parts[1]
+        if ref.startswith('refs/tags/'):
+            # Annotated tags also show up peeled, as "<tag>^{}".
+            tag = ref[len('refs/tags/'):].removesuffix('^{}')
+            if tag not in tags:
+                tags.append(tag)
+        elif ref.startswith('refs/heads/'):
+            branches.append(ref[len('refs/heads/'):])
+    return tags, branches
+
+
+class VersionIndex:
+    def __init__(self, index_path, ttl_seconds=DEFAULT_VERSION_INDEX_TTL_SECONDS):
+        self.index_path = Path(index_path)
+        self.ttl_seconds = ttl_seconds
+        self.entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as file:
+                self.entries = json.load(file)
+        except FileNotFoundError:
+            self.entries = {}
+        except json.JSONDecodeError as e:
+            print(f"Ignoring unreadable version index {self.index_path}: {e}")
+            self.entries = {}
+
+    def _save(self):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Every GUI using the package cache shares this index and may save it at the same time.
+        temp_path = self.index_path.with_name(
+            f"{self.index_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=4)
+        os.replace(temp_path, self.index_path)
+
+    def get_versions(self, package_name, git_url):
+        """
+        Returns the cached tags followed by branches for a package, or an empty list if
+        it has never been discovered. Entries for a different url are ignored.
+        """
+        with self._lock:
+            entry = self.entries.get(package_name)
+        if not entry or entry['git_url'] != git_url:
+            return []
+        return entry['tags'] + entry['branches']
+
+    def is_stale(self, package_name, git_url):
+        with self._lock:
+            entry = self.entries.get(package_name)
+        if not entry or entry['git_url'] != git_url:
+            return True
+        return time.time() - entry['fetched_at'] > self.ttl_seconds
+
+    def refresh(self, git_urls, force=False):
+        """
+        Queries the remotes of stale packages in parallel and stores the results.
+
+        Args:
+            git_urls (dict[str, str]): Package name to git url.
+            force (bool): Query every package, even ones whose entries are still fresh.
+
+        Returns:
+            dict[str, list[str]] of versions for each package that was refreshed.
+        """
+        stale_urls = {package_name: git_url for package_name, git_url in git_urls.items()
+                      if force or self.is_stale(package_name, git_url)}
+        if not stale_urls:
+            return {}
+
+        def discover(item):
+            package_name, git_url = item
+            return package_name, git_url, GitHelper.ls_remote(git_url)
+
+        refreshed = {}
+        worker_count = min(MAX_DISCOVERY_WORKERS, len(stale_urls))
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            for package_name, git_url, output in executor.map(discover, stale_urls.items()):
+                if output is None:
+                    print(f"Version discovery failed for {package_name}. Keeping cached versions.")
+                    continue
+                tags, branches = parse_ls_remote(output)
+                with self._lock:
+                    self.entries[package_name] = {
+                        'git_url': git_url,
+                        'fetched_at': time.time(),
+                        'tags': tags,
+                        'branches': branches,
+                    }
+                refreshed[package_name] = tags + branches
+
+        if refreshed:
+            try:
+                with self._lock:
+                    self._save()
+            except OSError as e:
+                # The versions are still good for this session.
+                print(f"Could not save version index {self.index_path}: {e}")
+        return refreshed
+
+    def refresh_in_background(self, git_urls, on_refreshed=None):
+        """
+        Runs refresh on a daemon thread so the caller never waits on the network.
+
+        Args:
+            git_urls (dict[str, str]): Package name to git url.
+            on_refreshed (callable): Called with refresh's result once it's done.
+
+        Returns:
+            The started threading.Thread.
+        """
+        def run():
+            try:
+                refreshed = self.refresh(git_urls)
+            except Exception as e:
+                print(f"Version discovery failed: {e}")
+                return
+            if refreshed and on_refreshed:
+                on_refreshed(refreshed)
+
+        thread = threading.Thread(target=run, name='version-discovery', daemon=True)
+        thread.start()
+        return thread